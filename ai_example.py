@@ -3,25 +3,34 @@ AI 调用示例脚本
 演示如何使用公共 AI 模块
 """
 
+import asyncio
 import os
 from dotenv import load_dotenv
-from utils.ai_helper import AIHelper, chat, chat_with_search
+from utils.ai_helper import AIHelper, chat_with_search
 
 # 加载环境变量
 load_dotenv()
 
+# 系统提示词保持逐字节不变，变化的内容放在用户消息末尾，便于服务端复用前缀缓存
+APPLIANCE_ANALYST_SYSTEM = "你是一个专业的家电分析师，擅长分析产品参数和性能"
+PRODUCT_ANALYST_SYSTEM = "你是一个专业的产品分析师"
+PRODUCT_WRITER_SYSTEM = "你是一个专业的产品文案撰写专家"
+PRODUCT_DESCRIPTION_PROMPT = "请写一段吸引人的产品描述，突出净化效果。\n产品名称: "
 
-def example_1_simple_chat():
-    """示例 1: 简单对话"""
-    print("\n" + "=" * 60)
-    print("示例 1: 简单对话")
-    print("=" * 60)
 
-    response = chat(
+# 各示例互不依赖，并发执行；每个示例先等待响应再整体打印，避免输出交错
+
+async def example_1_simple_chat():
+    """示例 1: 简单对话"""
+    response = await AIHelper.achat(
         prompt="请用一句话介绍 Python 编程语言",
         model="zhipu/glm-4-flash"
     )
 
+    print("\n" + "=" * 60)
+    print("示例 1: 简单对话")
+    print("=" * 60)
+
     if response.get("success"):
         print(f"AI 回复: {response['content']}")
         print(f"使用 Token: {response.get('usage', {})}")
@@ -29,35 +38,35 @@ def example_1_simple_chat():
         print(f"请求失败: {response.get('message')}")
 
 
-def example_2_chat_with_system():
+async def example_2_chat_with_system():
     """示例 2: 带系统提示词的对话"""
-    print("\n" + "=" * 60)
-    print("示例 2: 带系统提示词的对话")
-    print("=" * 60)
-
-    response = AIHelper.chat(
+    response = await AIHelper.achat(
         prompt="帮我分析一下空气净化器的关键指标",
-        system_prompt="你是一个专业的家电分析师，擅长分析产品参数和性能",
+        system_prompt=APPLIANCE_ANALYST_SYSTEM,
         model="zhipu/glm-4-flash"
     )
 
+    print("\n" + "=" * 60)
+    print("示例 2: 带系统提示词的对话")
+    print("=" * 60)
+
     if response.get("success"):
         print(f"AI 回复:\n{response['content']}")
     else:
         print(f"请求失败: {response.get('message')}")
 
 
-def example_3_web_search():
+async def example_3_web_search():
     """示例 3: 带联网搜索的对话"""
-    print("\n" + "=" * 60)
-    print("示例 3: 带联网搜索的对话")
-    print("=" * 60)
-
-    response = AIHelper.chat_with_web_search(
+    response = await AIHelper.achat_with_web_search(
         prompt="2024 年最好的空气净化器品牌有哪些？",
         model="zhipu/glm-4-flash"
     )
 
+    print("\n" + "=" * 60)
+    print("示例 3: 带联网搜索的对话")
+    print("=" * 60)
+
     if response.get("success"):
         print(f"AI 回复:\n{response['content']}")
 
@@ -68,64 +77,62 @@ def example_3_web_search():
         print(f"请求失败: {response.get('message')}")
 
 
-def example_4_conversation():
-    """示例 4: 多轮对话"""
-    print("\n" + "=" * 60)
-    print("示例 4: 多轮对话")
-    print("=" * 60)
+async def example_4_conversation():
+    """示例 4: 多轮对话（相互依赖的追问合并为一次请求）"""
+    questions = [
+        ("cadr_definition", "什么是 CADR 值？"),
+        ("cadr_for_50_sqm", "那么针对 50 平米的房间，建议多少 CADR 值？"),
+    ]
 
+    # 第二个问题可以从第一个问题预知，一次请求同时回答，省去一次往返
+    prompt = (
+        "请依次回答下面的问题，只返回一个 JSON 对象，键名如下：\n"
+        + "\n".join(f"- {key}: {question}" for key, question in questions)
+    )
     messages = [
-        {"role": "system", "content": "你是一个专业的产品分析师"},
-        {"role": "user", "content": "什么是 CADR 值？"},
+        {"role": "system", "content": PRODUCT_ANALYST_SYSTEM},
+        {"role": "user", "content": prompt},
     ]
 
-    # 第一轮
-    response1 = AIHelper.chat_conversation(messages)
-    if response1.get("success"):
-        print(f"用户: 什么是 CADR 值？")
-        print(f"AI: {response1['content']}\n")
-
-        # 添加 AI 回复到消息历史
-        messages.append({
-            "role": "assistant",
-            "content": response1['content']
-        })
-
-        # 第二轮追问
-        messages.append({
-            "role": "user",
-            "content": "那么针对 50 平米的房间，建议多少 CADR 值？"
-        })
-
-        response2 = AIHelper.chat_conversation(messages)
-        if response2.get("success"):
-            print(f"用户: 那么针对 50 平米的房间，建议多少 CADR 值？")
-            print(f"AI: {response2['content']}")
-        else:
-            print(f"第二轮失败: {response2.get('message')}")
-    else:
-        print(f"第一轮失败: {response1.get('message')}")
+    response = await AIHelper.achat_conversation(messages, temperature=0)
 
-
-def example_5_use_other_script():
-    """示例 5: 在其他脚本中使用"""
     print("\n" + "=" * 60)
-    print("示例 5: 在其他脚本中使用")
+    print("示例 4: 多轮对话")
     print("=" * 60)
 
+    if not response.get("success"):
+        print(f"请求失败: {response.get('message')}")
+        return
+
+    answers = AIHelper.extract_json(response['content'])
+    if not answers:
+        print(f"AI: {response['content']}")
+        return
+
+    for key, question in questions:
+        print(f"用户: {question}")
+        print(f"AI: {answers.get(key, 'N/A')}\n")
+
+
+async def example_5_use_other_script():
+    """示例 5: 在其他脚本中使用"""
     # 模拟在其他脚本中调用
     from utils.ai_helper import AIHelper
 
     # 获取产品描述
     product_name = "某品牌空气净化器"
-    prompt = f"请为 {product_name} 写一段吸引人的产品描述，突出净化效果"
+    prompt = PRODUCT_DESCRIPTION_PROMPT + product_name
 
-    response = AIHelper.chat(
+    response = await AIHelper.achat(
         prompt=prompt,
-        system_prompt="你是一个专业的产品文案撰写专家",
+        system_prompt=PRODUCT_WRITER_SYSTEM,
         temperature=0.9,  # 提高创造性
     )
 
+    print("\n" + "=" * 60)
+    print("示例 5: 在其他脚本中使用")
+    print("=" * 60)
+
     if response.get("success"):
         print(f"产品描述:\n{response['content']}")
     else:
@@ -152,6 +159,36 @@ def example_6_check_api_key():
     return True
 
 
+async def example_7_cached_chat():
+    """示例 7: 响应缓存（低温度请求重复调用时直接返回缓存结果）"""
+    prompt = "请用一句话介绍 PostgreSQL 数据库"
+    first = await AIHelper.achat(prompt=prompt, model="zhipu/glm-4-flash", temperature=0)
+    second = await AIHelper.achat(prompt=prompt, model="zhipu/glm-4-flash", temperature=0)
+
+    print("\n" + "=" * 60)
+    print("示例 7: 响应缓存")
+    print("=" * 60)
+
+    if first.get("success") and second.get("success"):
+        print(f"AI 回复: {second['content']}")
+        print(f"第一次调用命中缓存: {first.get('cached', False)}")
+        print(f"第二次调用命中缓存: {second.get('cached', False)}")
+    else:
+        print(f"请求失败: {first.get('message') or second.get('message')}")
+
+
+async def run_examples():
+    """运行示例：独立示例并发，耗时取决于最慢的一个而不是总和"""
+    await asyncio.gather(
+        example_1_simple_chat(),
+        example_2_chat_with_system(),
+        example_3_web_search(),
+        example_4_conversation(),
+        example_5_use_other_script(),
+        example_7_cached_chat(),
+    )
+
+
 def main():
     """运行所有示例"""
     print("\n" + "=" * 60)
@@ -164,11 +201,7 @@ def main():
 
     try:
         # 运行示例
-        example_1_simple_chat()
-        example_2_chat_with_system()
-        example_3_web_search()
-        example_4_conversation()
-        example_5_use_other_script()
+        asyncio.run(run_examples())
 
         print("\n" + "=" * 60)
         print("所有示例运行完成!")
@@ -3,13 +3,156 @@ Newegg 通用数据清洗脚本
 自动识别产品类型并提取规格参数，导入 PostgreSQL
 """
 
+import csv
+import functools
+import io
+import itertools
 import json
+import os
 import re
+from collections import deque
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import psycopg2
+import ijson
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+
+# ==================== 预编译正则 ====================
+# 每个类别的规格字段合并为一条带命名分组的交替正则，标题只需扫描一遍
+# 大小写不敏感的部分用 (?i:...) 局部开启，保持各字段原有的匹配语义
+# CPU
+_CPU_SPEC_RE = re.compile(
+    r'(?i:\b(?P<brand>AMD|Intel)\b)'
+    r'|(?i:\b(?P<series>Ryzen\s*[3579]|Ryzen\s+Threadripper|EPYC|Core\s*[ijU][3579]|Core\s+Ultra|Pentium|Celeron)\b)'
+    r'|\b(?P<model>\d{4,5}[A-Za-z]{0,4}[LXK]?)\b'
+    r'|(?i:(?P<cores>\d+)[\s-]*Co(?:re|res))'
+    r'|(?i:(?P<speed>\d+\.?\d*)\s*GHz)'
+    r'|(?i:Socket\s+(?P<socket_name>[A-Z0-9]+)|LGA\s*(?P<socket_lga>\d{4,5})|\b(?P<socket_am>AM[45])\b)'
+    r'|(?i:(?P<power>\d{2,3})\s*W(?:\s|,|$|\.|\)))'
+)
+
+# 主板
+_MB_SPEC_RE = re.compile(
+    r'(?i:(?P<socket>Socket\s+[A-Z0-9]+|LGA\s*\d{4,5}|AM[45]))'
+    r'|(?P<chipset>[ABCXYZ]\d{3,4}|[BZ]\d{3,})'
+)
+
+# 内存
+_MEM_SPEC_RE = re.compile(
+    r'(?P<capacity>\d+)\s*GB'
+    r'|(?P<speed>\d{4})\s*(?:MHz|PC5)'
+)
+
+# SSD
+_SSD_SPEC_RE = re.compile(
+    r'(?P<tb>\d+\.?\d*)\s*TB'
+    r'|(?P<gb>\d+)\s*GB(?!\s*\w)'
+    r'|(?P<read>\d+,?\d*)\s*MB/s'
+)
+
+# 笔记本 / 整机
+_CPU_MODEL_PATTERN = (
+    r'(?i:(?P<cpu>Intel Core [iU3579][-\s]*\d+[A-Za-z]{0,4}'
+    r'|Intel Core Ultra [3579]\s*\d+[A-Za-z]{0,4}'
+    r'|AMD Ryzen [3579]\s*\d{4}[A-Za-z]{0,4}'
+)
+_RAM_PATTERN = r'(?i:(?P<ram>\d+)\s*GB\s*DDR[45])'
+# "GeForce RTX xxxx" 一定先被更短的 "RTX xxxx" 命中，因此不单独列出
+_LAPTOP_SPEC_RE = re.compile(
+    _CPU_MODEL_PATTERN + r'|Intel Core \d+ Proces))'
+    r'|' + _RAM_PATTERN +
+    r'|(?i:(?P<storage_gb>\d+)\s*GB\s*(?P<storage_type>SSD|NVMe|M\.2))'
+    r'|(?i:(?P<storage_tb>\d+)\s*TB\s*SSD)'
+    r'|(?i:(?P<gpu>RTX\s*\d+[A-Za-z]{0,4}\s*Laptop|Radeon\s*RX\s*\d+[A-Za-z]{0,4}))'
+)
+# 屏幕尺寸取标题中第一个 "数字+空白/引号"，不能与其他字段合并扫描
+_LAPTOP_SCREEN_RE = re.compile(r'(\d+\.?\d*)["\s]')
+_PC_SPEC_RE = re.compile(
+    _CPU_MODEL_PATTERN + r'))'
+    r'|(?i:(?P<gpu>RTX\s*\d+[A-Za-z]{0,4}|GeForce\s*GTX\s*\d+[A-Za-z]{0,4}|Radeon\s*RX\s*\d+[A-Za-z]{0,4}))'
+    r'|' + _RAM_PATTERN +
+    r'|(?i:(?P<storage_size>\d+)\s*(?P<storage_unit>GB|TB)\s*SSD)'
+)
+
+# 类别识别分词：字母串和数字分开切分，"32GB" -> ["32", "gb"]，"M.2" 这类接口名保持为一个词元
+_TOKEN_RE = re.compile(r'[a-z]\.\d+|[a-z]+|\d+(?:\.\d+)?')
+
+# 价格 / Amazon 链接
+_PRICE_RE = re.compile(r'[\d,]+\.?\d*')
+_AMZ_MODEL_RE = re.compile(r'\d{4,5}[A-Za-z]{0,4}')
+_AMZ_BRANDS = ('AMD', 'Intel', 'ASUS', 'GIGABYTE', 'MSI', 'ASRock',
+               'CORSAIR', 'SAMSUNG', 'eufy', 'Arlo', 'Ubiquiti',
+               'Reolink', 'Kasa', 'Philips', 'Eve')
+_AMZ_BRAND_RE = re.compile(r'\b(' + '|'.join(_AMZ_BRANDS) + r')\b', re.IGNORECASE)
+_AMZ_BRAND_NAMES = {brand.lower(): brand for brand in _AMZ_BRANDS}
+
+# 同一前缀的搜索词会反复出现，缓存 URL 编码结果
+_quote_plus = functools.lru_cache(maxsize=4096)(urllib.parse.quote_plus)
+
+
+def _brand_table(*brands):
+    """预先生成 (显示名, 小写形式) 品牌表，避免每条记录重复 lower()"""
+    return tuple((brand, brand.lower()) for brand in brands)
+
+
+# 各类别品牌列表（按匹配优先级排列）
+_MB_BRANDS = _brand_table('ASUS', 'GIGABYTE', 'MSI', 'ASRock')
+_MEM_BRANDS = _brand_table('CORSAIR', 'G.SKILL', 'Kingston', 'Crucial', 'Patriot')
+_SSD_BRANDS = _brand_table('SAMSUNG', 'Western Digital', 'WD', 'Crucial', 'Patriot',
+                           'Kingston', 'Sabrent', 'Solidigm')
+_LAPTOP_BRANDS = _brand_table('ASUS', 'MSI', 'Acer', 'Lenovo', 'Dell', 'HP', 'Razer',
+                              'GIGABYTE', 'XIDAX')
+_PC_BRANDS = _brand_table('ABS', 'iBUYPOWER', 'CYBERPOWERPC', 'Skytech', 'CLX', 'Xidax')
+
+# 数据清洗时每处理多少条记录打印一次进度（不再逐条打印）
+PROGRESS_EVERY = 500
+
+# 并行清洗时每个任务包含的记录数，以及每个工作进程最多排队的任务数（限制同时驻留内存的记录）
+PROCESS_BATCH_SIZE = 256
+MAX_PENDING_PER_WORKER = 2
+
+# 批量导入前删除、导入后重建的二级索引: (索引名, 列名)
+_SECONDARY_INDEXES = (
+    ('idx_newegg_category', 'category'),
+    ('idx_newegg_brand', 'brand'),
+    ('idx_newegg_price', 'price'),
+)
+
+
+def _scan_specs(pattern, title):
+    """单次扫描标题，返回每个命名分组第一次命中的值"""
+    found = {}
+    for match in pattern.finditer(title):
+        for name, value in match.groupdict().items():
+            if value is not None and name not in found:
+                found[name] = value
+    return found
+
+
+def _singular(token):
+    """简单的英文复数归一化（cameras -> camera, switches -> switch）"""
+    if len(token) > 3:
+        if token.endswith(('ches', 'shes', 'xes')):
+            return token[:-2]
+        if token.endswith('s') and not token.endswith('ss'):
+            return token[:-1]
+    return token
+
+
+def _tokenize(text_lower):
+    """把已转小写的文本切分为归一化后的词元列表"""
+    return [_singular(token) for token in _TOKEN_RE.findall(text_lower)]
+
+
+def _find_brand(brands, title_lower):
+    """在已转小写的标题中按顺序查找第一个出现的品牌"""
+    for brand, brand_lower in brands:
+        if brand_lower in title_lower:
+            return brand
+    return None
 
 
 class NeweggDataProcessor:
@@ -32,9 +175,10 @@ class NeweggDataProcessor:
             'password': 'LGligang12345',
             'connect_timeout': 10
         }
-        self.raw_data = []
+        self.raw_count = 0
         self.processed_data = []
         self.discarded_count = 0
+        self._pool = None
 
         # 产品类型识别关键词（注意：优先级高的放在前面）
         self.category_keywords = {
@@ -55,95 +199,108 @@ class NeweggDataProcessor:
             'Other': []
         }
 
+        # 关键词统一预先转为小写，避免每条记录重复 lower()
+        self._lowered_keywords = {
+            category: [keyword.lower() for keyword in keywords]
+            for category, keywords in self.category_keywords.items()
+        }
+
+        # 每个类别的关键词预先分词为 n-gram 元组集合（多词关键词如 "gaming pc" 为二元组）
+        # 按词元整体匹配，避免 "Case" 命中 "Casing"、"ITX" 命中 "SWITCH" 之类的子串误判
+        self._category_ngrams = {
+            category: frozenset(tuple(_tokenize(keyword)) for keyword in keywords)
+            for category, keywords in self._lowered_keywords.items()
+        }
+        self._max_keyword_tokens = max(
+            (len(ngram) for ngrams in self._category_ngrams.values() for ngram in ngrams),
+            default=1
+        )
+
+        # 类别 -> 规格解析方法，normalize_record 中按字典分发
+        self._spec_parsers = {
+            'CPU': self.parse_cpu_specs,
+            'Motherboard': self.parse_motherboard_specs,
+            'Memory': self.parse_memory_specs,
+            'SSD': self.parse_ssd_specs,
+            'Laptop': self.parse_laptop_specs,
+            'Gaming PC': self.parse_gaming_pc_specs,
+        }
+
     def load_data(self):
-        """加载原始 JSON 数据"""
+        """检查原始 JSON 数据文件（数据在 process_all 中流式读取）"""
         if not self.input_file.exists():
             raise FileNotFoundError(f"找不到文件: {self.input_file}")
 
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            self.raw_data = json.load(f)
+        print(f"数据文件: {self.input_file}")
 
-        print(f"已加载 {len(self.raw_data)} 条原始数据")
+    def _iter_raw(self):
+        """流式解析原始 JSON 数组，逐条产出记录"""
+        with open(self.input_file, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
 
-    def detect_category(self, title):
+    def detect_category(self, title_lower):
         """
         根据标题自动识别产品类别
 
         Args:
-            title: 产品标题
+            title_lower: 已转为小写的产品标题
 
         Returns:
             产品类别
         """
-        title_lower = title.lower()
+        # 标题分词一次，生成所有长度不超过最长关键词的 n-gram
+        tokens = _tokenize(title_lower)
+        title_ngrams = set()
+        for n in range(1, self._max_keyword_tokens + 1):
+            title_ngrams.update(zip(*(tokens[i:] for i in range(n))))
 
-        for category, keywords in self.category_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in title_lower:
-                    return category
+        # 按优先级顺序检查，集合求交为 O(1) 成员测试
+        for category, keyword_ngrams in self._category_ngrams.items():
+            if not keyword_ngrams.isdisjoint(title_ngrams):
+                return category
 
         return 'Other'
 
-    def parse_cpu_specs(self, title):
+    def parse_cpu_specs(self, title, title_lower):
         """解析 CPU 规格"""
         result = {
             'brand': None, 'series': None, 'model': None,
             'cores': None, 'speed': None, 'socket': None, 'power': None
         }
 
-        # Brand
-        brand_match = re.search(r'\b(AMD|Intel)\b', title, re.IGNORECASE)
-        if brand_match:
-            result['brand'] = brand_match.group(1)
-
-        # Series
-        series_patterns = [
-            r'\b(Ryzen\s*[3579]|Ryzen\s+Threadripper|EPYC)\b',
-            r'\b(Core\s*[ijU][3579]|Core\s+Ultra)\b',
-            r'\b(Pentium|Celeron)\b'
-        ]
-        for pattern in series_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                result['series'] = match.group(1).strip()
-                break
-
-        # Model
-        model_match = re.search(r'\b(\d{4,5}[A-Za-z]{0,4}[LXK]?)\b', title)
-        if model_match:
-            result['model'] = model_match.group(1)
+        found = _scan_specs(_CPU_SPEC_RE, title)
+
+        # Brand / Series / Model
+        result['brand'] = found.get('brand')
+        if found.get('series'):
+            result['series'] = found['series'].strip()
+        result['model'] = found.get('model')
 
         # Cores
-        cores_match = re.search(r'(\d+)[\s-]*Co(?:re|res)', title, re.IGNORECASE)
-        if cores_match:
-            result['cores'] = int(cores_match.group(1))
+        if found.get('cores'):
+            result['cores'] = int(found['cores'])
 
         # Speed
-        speed_match = re.search(r'(\d+\.?\d*)\s*GHz', title, re.IGNORECASE)
-        if speed_match:
-            result['speed'] = f"{speed_match.group(1)} GHz"
+        if found.get('speed'):
+            result['speed'] = f"{found['speed']} GHz"
 
         # Socket
-        socket_patterns = [r'Socket\s+([A-Z0-9]+)', r'LGA\s*(\d{4,5})', r'\b(AM[45])\b']
-        for pattern in socket_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                socket_val = match.group(1).strip()
-                if not socket_val.startswith('LGA') and not socket_val.startswith('AM'):
-                    socket_val = f"Socket {socket_val}"
-                result['socket'] = socket_val
-                break
+        socket_val = found.get('socket_name') or found.get('socket_lga') or found.get('socket_am')
+        if socket_val:
+            socket_val = socket_val.strip()
+            if not socket_val.startswith('LGA') and not socket_val.startswith('AM'):
+                socket_val = f"Socket {socket_val}"
+            result['socket'] = socket_val
 
         # Power
-        power_match = re.search(r'(\d{2,3})\s*W(?:\s|,|$|\.|\))', title, re.IGNORECASE)
-        if power_match:
-            power_val = int(power_match.group(1))
+        if found.get('power'):
+            power_val = int(found['power'])
             if 35 <= power_val <= 350:
                 result['power'] = f"{power_val}W"
 
         return result
 
-    def parse_motherboard_specs(self, title):
+    def parse_motherboard_specs(self, title, title_lower):
         """解析主板规格"""
         result = {
             'brand': None, 'chipset': None, 'socket': None,
@@ -151,21 +308,12 @@ class NeweggDataProcessor:
         }
 
         # Brand
-        brands = ['ASUS', 'GIGABYTE', 'MSI', 'ASRock', 'MSI']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                result['brand'] = brand
-                break
+        result['brand'] = _find_brand(_MB_BRANDS, title_lower)
 
-        # Chipset
-        chipset_match = re.search(r'([ABCXYZ]\d{3,4}|[BZ]\d{3,})', title)
-        if chipset_match:
-            result['chipset'] = chipset_match.group(1)
-
-        # Socket
-        socket_match = re.search(r'Socket\s+([A-Z0-9]+)|LGA\s*(\d{4,5})|AM[45]', title, re.IGNORECASE)
-        if socket_match:
-            result['socket'] = socket_match.group(0)
+        # Chipset / Socket
+        found = _scan_specs(_MB_SPEC_RE, title)
+        result['chipset'] = found.get('chipset')
+        result['socket'] = found.get('socket')
 
         # Form Factor
         if 'ATX' in title:
@@ -183,23 +331,20 @@ class NeweggDataProcessor:
 
         return result
 
-    def parse_memory_specs(self, title):
+    def parse_memory_specs(self, title, title_lower):
         """解析内存规格"""
         result = {
             'brand': None, 'capacity_gb': None, 'type': None, 'speed_mhz': None
         }
 
         # Brand
-        brands = ['CORSAIR', 'G.SKILL', 'Kingston', 'Crucial', 'Patriot']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                result['brand'] = brand
-                break
+        result['brand'] = _find_brand(_MEM_BRANDS, title_lower)
+
+        found = _scan_specs(_MEM_SPEC_RE, title)
 
         # Capacity
-        capacity_match = re.search(r'(\d+)\s*GB', title)
-        if capacity_match:
-            result['capacity_gb'] = int(capacity_match.group(1))
+        if found.get('capacity'):
+            result['capacity_gb'] = int(found['capacity'])
 
         # Type
         if 'DDR5' in title:
@@ -208,13 +353,12 @@ class NeweggDataProcessor:
             result['type'] = 'DDR4'
 
         # Speed
-        speed_match = re.search(r'(\d{4})\s*(?:MHz|PC5)', title)
-        if speed_match:
-            result['speed_mhz'] = int(speed_match.group(1))
+        if found.get('speed'):
+            result['speed_mhz'] = int(found['speed'])
 
         return result
 
-    def parse_ssd_specs(self, title):
+    def parse_ssd_specs(self, title, title_lower):
         """解析 SSD 规格"""
         result = {
             'brand': None, 'capacity_gb': None, 'interface': None,
@@ -222,23 +366,18 @@ class NeweggDataProcessor:
         }
 
         # Brand
-        brands = ['SAMSUNG', 'Western Digital', 'WD', 'Crucial', 'Patriot', 'Kingston', 'Sabrent', 'Solidigm']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                result['brand'] = brand
-                break
+        result['brand'] = _find_brand(_SSD_BRANDS, title_lower)
+
+        found = _scan_specs(_SSD_SPEC_RE, title)
 
         # Capacity - 改进正则表达式以更准确地匹配
-        # 先尝试匹配 TB 格式（带小数点的，如 7.68TB, 3.84TB）
-        capacity_match = re.search(r'(\d+\.?\d*)\s*TB', title)
-        if capacity_match:
-            tb_value = float(capacity_match.group(1))
+        # 优先使用 TB 格式（带小数点的，如 7.68TB, 3.84TB）
+        if found.get('tb'):
+            tb_value = float(found['tb'])
             result['capacity_gb'] = int(tb_value * 1024)
-        else:
-            # 匹配 GB 格式，排除包含 TB 的情况（避免 7.68TB 被误匹配为 68GB）
-            capacity_match = re.search(r'(\d+)\s*GB(?!\s*\w)', title)
-            if capacity_match:
-                result['capacity_gb'] = int(capacity_match.group(1))
+        elif found.get('gb'):
+            # GB 格式，排除包含 TB 的情况（避免 7.68TB 被误匹配为 68GB）
+            result['capacity_gb'] = int(found['gb'])
 
         # Interface
         if 'PCIe Gen4' in title or 'PCIe 4.0' in title:
@@ -247,9 +386,7 @@ class NeweggDataProcessor:
             result['interface'] = 'PCIe Gen3'
 
         # Read Speed
-        read_match = re.search(r'(\d+,?\d*)\s*MB/s', title)
-        if read_match:
-            result['read_speed'] = read_match.group(1)
+        result['read_speed'] = found.get('read')
 
         # Form Factor
         if 'M.2' in title:
@@ -259,7 +396,7 @@ class NeweggDataProcessor:
 
         return result
 
-    def parse_laptop_specs(self, title):
+    def parse_laptop_specs(self, title, title_lower):
         """解析笔记本规格"""
         result = {
             'brand': None, 'cpu': None, 'ram': None,
@@ -267,59 +404,36 @@ class NeweggDataProcessor:
         }
 
         # Brand
-        brands = ['ASUS', 'MSI', 'Acer', 'Lenovo', 'Dell', 'HP', 'Razer', 'GIGABYTE', 'XIDAX']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                result['brand'] = brand
-                break
+        result['brand'] = _find_brand(_LAPTOP_BRANDS, title_lower)
+
+        found = _scan_specs(_LAPTOP_SPEC_RE, title)
 
         # CPU
-        cpu_patterns = [
-            r'(Intel Core [iU3579][-\s]*\d+[A-Za-z]{0,4})',
-            r'(Intel Core Ultra [3579]\s*\d+[A-Za-z]{0,4})',
-            r'(AMD Ryzen [3579]\s*\d{4}[A-Za-z]{0,4})',
-            r'(Intel Core \d+ Proces)',
-        ]
-        for pattern in cpu_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                result['cpu'] = match.group(1).strip()
-                break
+        if found.get('cpu'):
+            result['cpu'] = found['cpu'].strip()
 
         # RAM
-        ram_match = re.search(r'(\d+)\s*GB\s*DDR[45]', title, re.IGNORECASE)
-        if ram_match:
-            result['ram'] = f"{ram_match.group(1)} GB"
+        if found.get('ram'):
+            result['ram'] = f"{found['ram']} GB"
 
         # Storage
-        storage_match = re.search(r'(\d+)\s*GB\s*(SSD|NVMe|M\.2)', title, re.IGNORECASE)
-        if storage_match:
-            result['storage'] = f"{storage_match.group(1)} GB {storage_match.group(2)}"
-        else:
-            storage_match = re.search(r'(\d+)\s*TB\s*SSD', title, re.IGNORECASE)
-            if storage_match:
-                result['storage'] = f"{storage_match.group(1)} TB SSD"
+        if found.get('storage_gb'):
+            result['storage'] = f"{found['storage_gb']} GB {found['storage_type']}"
+        elif found.get('storage_tb'):
+            result['storage'] = f"{found['storage_tb']} TB SSD"
 
         # Screen Size
-        screen_match = re.search(r'(\d+\.?\d*)["\s]', title)
+        screen_match = _LAPTOP_SCREEN_RE.search(title)
         if screen_match and float(screen_match.group(1)) >= 10 and float(screen_match.group(1)) <= 20:
             result['screen_size'] = f"{screen_match.group(1)} inch"
 
         # GPU
-        gpu_patterns = [
-            r'(RTX\s*\d+[A-Za-z]{0,4}\s*Laptop)',
-            r'(GeForce\s*RTX\s*\d+[A-Za-z]{0,4}\s*Laptop)',
-            r'(Radeon\s*RX\s*\d+[A-Za-z]{0,4})',
-        ]
-        for pattern in gpu_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                result['gpu'] = match.group(1).strip()
-                break
+        if found.get('gpu'):
+            result['gpu'] = found['gpu'].strip()
 
         return result
 
-    def parse_gaming_pc_specs(self, title):
+    def parse_gaming_pc_specs(self, title, title_lower):
         """解析整机规格"""
         result = {
             'brand': None, 'cpu': None, 'gpu': None,
@@ -327,46 +441,23 @@ class NeweggDataProcessor:
         }
 
         # Brand
-        brands = ['ABS', 'iBUYPOWER', 'CYBERPOWERPC', 'Skytech', 'CLX', 'Xidax']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                result['brand'] = brand
-                break
+        result['brand'] = _find_brand(_PC_BRANDS, title_lower)
 
-        # CPU
-        cpu_patterns = [
-            r'(Intel Core [iU3579][-\s]*\d+[A-Za-z]{0,4})',
-            r'(Intel Core Ultra [3579]\s*\d+[A-Za-z]{0,4})',
-            r'(AMD Ryzen [3579]\s*\d{4}[A-Za-z]{0,4})',
-        ]
-        for pattern in cpu_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                result['cpu'] = match.group(1).strip()
-                break
+        found = _scan_specs(_PC_SPEC_RE, title)
 
-        # GPU
-        gpu_patterns = [
-            r'(RTX\s*\d+[A-Za-z]{0,4})',
-            r'(GeForce\s*RTX\s*\d+[A-Za-z]{0,4})',
-            r'(GeForce\s*GTX\s*\d+[A-Za-z]{0,4})',
-            r'(Radeon\s*RX\s*\d+[A-Za-z]{0,4})',
-        ]
-        for pattern in gpu_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                result['gpu'] = match.group(1).strip()
-                break
+        # CPU / GPU
+        if found.get('cpu'):
+            result['cpu'] = found['cpu'].strip()
+        if found.get('gpu'):
+            result['gpu'] = found['gpu'].strip()
 
         # RAM
-        ram_match = re.search(r'(\d+)\s*GB\s*DDR[45]', title, re.IGNORECASE)
-        if ram_match:
-            result['ram'] = f"{ram_match.group(1)} GB"
+        if found.get('ram'):
+            result['ram'] = f"{found['ram']} GB"
 
         # Storage
-        storage_match = re.search(r'(\d+)\s*(GB|TB)\s*SSD|NVMe', title, re.IGNORECASE)
-        if storage_match:
-            result['storage'] = f"{storage_match.group(1)} {storage_match.group(2)} SSD"
+        if found.get('storage_size'):
+            result['storage'] = f"{found['storage_size']} {found['storage_unit']} SSD"
 
         return result
 
@@ -375,7 +466,7 @@ class NeweggDataProcessor:
         if not price_str or price_str == '0':
             return None
 
-        numbers = re.findall(r'[\d,]+\.?\d*', str(price_str))
+        numbers = _PRICE_RE.findall(str(price_str))
         if numbers:
             price = float(numbers[0].replace(',', ''))
             return price if price > 0 else None
@@ -395,18 +486,14 @@ class NeweggDataProcessor:
         # 简化标题用于搜索
         search_terms = []
 
-        # 提取品牌
-        brands = ['AMD', 'Intel', 'ASUS', 'GIGABYTE', 'MSI', 'ASRock',
-                  'CORSAIR', 'SAMSUNG', 'eufy', 'Arlo', 'Ubiquiti',
-                  'Reolink', 'Kasa', 'Philips', 'Eve']
-        for brand in brands:
-            if brand.lower() in title.lower():
-                search_terms.append(brand)
-                break
+        # 提取品牌（单条交替正则，按整词匹配，统一为标准写法）
+        brand_match = _AMZ_BRAND_RE.search(title)
+        if brand_match:
+            search_terms.append(_AMZ_BRAND_NAMES[brand_match.group(1).lower()])
 
         # 提取关键词
         if category == 'CPU':
-            model_match = re.search(r'\d{4,5}[A-Za-z]{0,4}', title)
+            model_match = _AMZ_MODEL_RE.search(title)
             if model_match:
                 search_terms.append(model_match.group())
         else:
@@ -418,7 +505,7 @@ class NeweggDataProcessor:
             search_terms = title.split()[:3]
 
         search_term = " ".join(search_terms[:4])  # 限制为4个关键词
-        encoded_search = urllib.parse.quote_plus(search_term)
+        encoded_search = _quote_plus(search_term)
 
         return f"https://www.amazon.com/s?k={encoded_search}&tag=YOUR_TAG-20"
 
@@ -439,8 +526,11 @@ class NeweggDataProcessor:
         if not price:
             return None
 
+        # 标题只转一次小写，供类别识别和品牌匹配复用
+        title_lower = title.lower()
+
         # 识别类别
-        category = self.detect_category(title)
+        category = self.detect_category(title_lower)
 
         normalized = {
             'original_data': record,
@@ -453,35 +543,13 @@ class NeweggDataProcessor:
             'processed_at': datetime.now().isoformat()
         }
 
-        # 根据类别解析规格
-        if category == 'CPU':
-            specs = self.parse_cpu_specs(title)
+        # 根据类别解析规格（字典分发，其他类别只保存基本信息）
+        parser = self._spec_parsers.get(category)
+        if parser:
+            specs = parser(title, title_lower)
             normalized['brand'] = specs.get('brand')
             normalized['specs'] = specs  # 直接保存 dict，psycopg2 自动转换为 JSONB
-        elif category == 'Motherboard':
-            specs = self.parse_motherboard_specs(title)
-            normalized['brand'] = specs.get('brand')
-            normalized['specs'] = specs
-        elif category == 'Memory':
-            specs = self.parse_memory_specs(title)
-            normalized['brand'] = specs.get('brand')
-            normalized['specs'] = specs
-        elif category == 'SSD':
-            specs = self.parse_ssd_specs(title)
-            normalized['brand'] = specs.get('brand')
-            normalized['specs'] = specs
-        elif category == 'Laptop':
-            # 笔记本特殊处理 - 提取基本规格
-            specs = self.parse_laptop_specs(title)
-            normalized['brand'] = specs.get('brand')
-            normalized['specs'] = specs
-        elif category == 'Gaming PC':
-            # 整机特殊处理 - 提取基本规格
-            specs = self.parse_gaming_pc_specs(title)
-            normalized['brand'] = specs.get('brand')
-            normalized['specs'] = specs
         else:
-            # 其他类别，只保存基本信息
             normalized['brand'] = None
             normalized['specs'] = {}
 
@@ -499,32 +567,51 @@ class NeweggDataProcessor:
         valid_records = []
         category_count = {}
 
-        for idx, record in enumerate(self.raw_data, 1):
-            normalized = self.normalize_record(record)
-
-            if normalized:
-                valid_records.append(normalized)
-                category = normalized['category']
-                category_count[category] = category_count.get(category, 0) + 1
-
-                brand = normalized.get('brand') or 'Unknown'
-                title_short = normalized['title'][:40]
-                print(f"[{idx}/{len(self.raw_data)}] [OK] [{category}] {brand} - {title_short}...")
-            else:
-                self.discarded_count += 1
-                title_short = record.get('title', '')[:40]
-                print(f"[{idx}/{len(self.raw_data)}] [X] 已丢弃: {title_short}...")
+        # 每条记录相互独立，分批分发到多个进程并行清洗（结果保持原始顺序）；
+        # 在途任务数有上限，流式读取的原始记录不会被一次性读入内存
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for idx, (title, normalized) in enumerate(
+                    self._iter_normalized(executor, workers * MAX_PENDING_PER_WORKER), 1):
+                if normalized:
+                    valid_records.append(normalized)
+                    category = normalized['category']
+                    category_count[category] = category_count.get(category, 0) + 1
+                else:
+                    # 丢弃记录较少，仍逐条提示
+                    self.discarded_count += 1
+                    print(f"[{idx}] [X] 已丢弃: {title[:40]}...")
+
+                if idx % PROGRESS_EVERY == 0:
+                    print(f"已处理 {idx} 条，有效 {len(valid_records)} 条")
+
+                self.raw_count = idx
 
         self.processed_data = valid_records
 
         print("=" * 60)
         print(f"数据处理完成!")
+        print(f"  原始记录: {self.raw_count}")
         print(f"  有效记录: {len(self.processed_data)}")
         print(f"  丢弃记录: {self.discarded_count}")
         print(f"\n类别分布:")
         for cat, count in sorted(category_count.items()):
             print(f"  {cat}: {count}")
 
+    def _iter_normalized(self, executor, max_pending):
+        """按原始顺序产出 (标题, 标准化结果)，同时最多只有 max_pending 个批次在途"""
+        raw = self._iter_raw()
+        pending = deque()
+        while True:
+            while len(pending) < max_pending:
+                batch = list(itertools.islice(raw, PROCESS_BATCH_SIZE))
+                if not batch:
+                    break
+                pending.append(executor.submit(_normalize_batch_in_worker, batch))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
     def save_to_json(self, output_file= "newegg_processed.json"):
         """保存处理后的数据到 JSON"""
         output_path = Path(output_file)
@@ -534,14 +621,21 @@ class NeweggDataProcessor:
 
         print(f"\n已保存处理后的数据到: {output_path.absolute()}")
 
-    def connect_db(self):
-        """连接 PostgreSQL 数据库"""
-        try:
-            conn = psycopg2.connect(**self.db_config)
-            return conn
-        except Exception as e:
-            print(f"数据库连接失败: {e}")
-            raise
+    def get_pool(self):
+        """获取 PostgreSQL 连接池（首次调用时创建）"""
+        if self._pool is None:
+            try:
+                self._pool = ThreadedConnectionPool(minconn=2, maxconn=8, **self.db_config)
+            except Exception as e:
+                print(f"数据库连接失败: {e}")
+                raise
+        return self._pool
+
+    def close_pool(self):
+        """关闭连接池中的所有连接"""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
 
     def create_table_if_not_exists(self, conn):
         """创建数据表（如果不存在）"""
@@ -562,6 +656,19 @@ class NeweggDataProcessor:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
+        -- 标题唯一约束（ON CONFLICT (title) 依赖该约束）：已存在则跳过，
+        -- 否则先建唯一索引再挂为约束，避免在已有约束上重复建一个唯一索引
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'unique_newegg_title'
+            ) THEN
+                CREATE UNIQUE INDEX IF NOT EXISTS unique_newegg_title_idx ON newegg_products (title);
+                ALTER TABLE newegg_products
+                    ADD CONSTRAINT unique_newegg_title UNIQUE USING INDEX unique_newegg_title_idx;
+            END IF;
+        END $$;
+
         -- 创建索引
         CREATE INDEX IF NOT EXISTS idx_newegg_category ON newegg_products(category);
         CREATE INDEX IF NOT EXISTS idx_newegg_brand ON newegg_products(brand);
@@ -583,87 +690,171 @@ class NeweggDataProcessor:
             conn.rollback()
             raise
 
-    def insert_data(self, conn):
-        """插入数据到数据库"""
-        insert_sql = """
+    def copy_insert(self, conn):
+        """
+        通过 COPY 批量导入数据库
+
+        先用 COPY FROM STDIN 把数据流式写入 UNLOGGED 暂存表，
+        再用一条 INSERT ... SELECT ... ON CONFLICT 合并到正式表
+        """
+        # 仅对本次导入事务生效的会话参数
+        tune_session_sql = """
+        SET LOCAL synchronous_commit = off;
+        SET LOCAL maintenance_work_mem = '512MB';
+        """
+
+        # 暂存表使用 UNLOGGED，不写 WAL；正式表仍是普通表，合并结果可崩溃恢复
+        create_stage_sql = """
+        CREATE UNLOGGED TABLE IF NOT EXISTS newegg_products_stage
+            (LIKE newegg_products INCLUDING DEFAULTS);
+        TRUNCATE newegg_products_stage;
+        """
+
+        copy_sql = """
+        COPY newegg_products_stage (
+            title, category, brand, price, image_url, product_link,
+            amazon_link, item_features, specs, processed_at
+        ) FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+        """
+
+        # 暂存表刚装满数据，先收集统计信息，让合并时规划器按实际行数选择哈希/归并连接
+        analyze_stage_sql = "ANALYZE newegg_products_stage;"
+
+        # 整批集合式合并：一条语句完成冲突检测与更新，随后清空暂存表
+        merge_sql = """
         INSERT INTO newegg_products (
             title, category, brand, price, image_url, product_link,
             amazon_link, item_features, specs, processed_at
-        ) VALUES (
-            %(title)s, %(category)s, %(brand)s, %(price)s, %(image_url)s, %(product_link)s,
-            %(amazon_link)s, %(item_features)s, %(specs)s, %(processed_at)s
         )
+        SELECT
+            title, category, brand, price, image_url, product_link,
+            amazon_link, item_features, specs, processed_at
+        FROM newegg_products_stage
         ON CONFLICT (title) DO UPDATE SET
             category = EXCLUDED.category,
             brand = EXCLUDED.brand,
             price = EXCLUDED.price,
             amazon_link = EXCLUDED.amazon_link,
             specs = EXCLUDED.specs,
-            updated_at = CURRENT_TIMESTAMP
+            updated_at = CURRENT_TIMESTAMP;
+        TRUNCATE newegg_products_stage;
         """
 
         try:
             with conn.cursor() as cur:
-                # 添加唯一约束（如果不存在）
-                try:
-                    cur.execute("""
-                        SELECT EXISTS (
-                            SELECT 1 FROM pg_constraint
-                            WHERE conname = 'unique_newegg_title'
-                        )
-                    """)
-                    constraint_exists = cur.fetchone()[0]
-
-                    if not constraint_exists:
-                        cur.execute("""
-                            ALTER TABLE newegg_products
-                            ADD CONSTRAINT unique_newegg_title
-                            UNIQUE (title)
-                        """)
-                        print("已添加唯一约束: unique_newegg_title")
-                except Exception as e:
-                    print(f"添加约束警告: {e}")
-
-                # 批量插入，转换 dict/list 为 JSON 字符串给 psycopg2
-                for record in self.processed_data:
-                    # 准备数据库记录（转换 dict/list 为 JSON 字符串）
-                    db_record = record.copy()
-
-                    # 将 specs dict 转换为 JSON 字符串
-                    if isinstance(db_record.get('specs'), dict):
-                        db_record['specs'] = json.dumps(db_record['specs'], ensure_ascii=False)
-                    elif db_record.get('specs') is None:
-                        db_record['specs'] = json.dumps({}, ensure_ascii=False)
+                cur.execute(tune_session_sql)
+                cur.execute(create_stage_sql)
+
+                # 同一批次内 ON CONFLICT 不能重复更新同一行，按标题去重（保留最后一条）
+                records = {record['title']: record for record in self.processed_data}.values()
+
+                # 构建内存中的 CSV，JSONB 列先编码为 JSON 文本，None 写为 \N
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                for record in records:
+                    row = [
+                        record['title'],
+                        record['category'],
+                        record.get('brand'),
+                        record['price'],
+                        record.get('image_url'),
+                        record.get('product_link'),
+                        record.get('amazon_link'),
+                        json.dumps(record.get('item_features') or [], ensure_ascii=False),
+                        json.dumps(record.get('specs') or {}, ensure_ascii=False),
+                        record.get('processed_at'),
+                    ]
+                    writer.writerow(['\\N' if v is None else v for v in row])
+                buf.seek(0)
+
+                cur.copy_expert(copy_sql, buf)
+                cur.execute(analyze_stage_sql)
+                cur.execute(merge_sql)
 
-                    # 将 item_features list 转换为 JSON 字符串
-                    if isinstance(db_record.get('item_features'), list):
-                        db_record['item_features'] = json.dumps(db_record['item_features'], ensure_ascii=False)
-                    elif db_record.get('item_features') is None:
-                        db_record['item_features'] = json.dumps([], ensure_ascii=False)
-
-                    cur.execute(insert_sql, db_record)
+                conn.commit()
+                print(f"成功通过 COPY 导入 {len(records)} 条记录到数据库")
+        except Exception as e:
+            print(f"COPY 导入数据失败: {e}")
+            conn.rollback()
+            raise
 
+    def _drop_indexes(self, conn):
+        """批量导入前删除二级索引，避免逐行维护索引"""
+        index_names = ", ".join(name for name, _ in _SECONDARY_INDEXES)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP INDEX IF EXISTS {index_names}")
                 conn.commit()
-                print(f"成功插入 {len(self.processed_data)} 条记录到数据库")
         except Exception as e:
-            print(f"插入数据失败: {e}")
+            print(f"删除索引失败: {e}")
+            conn.rollback()
+            raise
+
+    def _create_index(self, index_name, column):
+        """
+        使用独立的池化连接创建单个索引
+
+        批量刷新期间没有其他写入，使用普通 CREATE INDEX：其 SHARE 锁互相兼容，多个索引可以真正并行构建
+        （CONCURRENTLY 的 SHARE UPDATE EXCLUSIVE 锁互相冲突，会排队执行且每个索引扫描两遍表）
+        """
+        pool = self.get_pool()
+        conn = pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                # SET LOCAL 只在本事务内生效，提交或回滚后自动恢复
+                cur.execute("SET LOCAL maintenance_work_mem = '512MB'")
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON newegg_products({column})"
+                )
+            conn.commit()
+        except Exception:
             conn.rollback()
             raise
+        finally:
+            pool.putconn(conn)
+
+    def _rebuild_indexes(self):
+        """导入完成后并行重建二级索引"""
+        with ThreadPoolExecutor(max_workers=len(_SECONDARY_INDEXES)) as executor:
+            futures = [
+                executor.submit(self._create_index, name, column)
+                for name, column in _SECONDARY_INDEXES
+            ]
+            for future in futures:
+                future.result()
+        print("索引重建完成")
 
     def save_to_database(self):
         """保存数据到 PostgreSQL"""
         print("\n" + "=" * 60)
         print("开始连接数据库...")
 
-        conn = self.connect_db()
+        pool = self.get_pool()
         print(f"数据库连接成功: {self.db_config['host']}:{self.db_config['port']}/{self.db_config['database']}")
 
+        # DDL 和数据导入分别使用连接池中的独立连接
+        ddl_conn = pool.getconn()
+        load_conn = pool.getconn()
+
         try:
-            self.create_table_if_not_exists(conn)
-            self.insert_data(conn)
+            self.create_table_if_not_exists(ddl_conn)
+
+            # 删除索引 -> 批量导入 -> 并行重建索引（导入失败也要恢复索引）
+            self._drop_indexes(ddl_conn)
+            try:
+                self.copy_insert(load_conn)
+            except Exception:
+                # 重建失败只记录，不覆盖导入失败的原始异常
+                try:
+                    self._rebuild_indexes()
+                except Exception as e:
+                    print(f"重建索引失败: {e}")
+                raise
+            self._rebuild_indexes()
 
             # 查询统计
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with ddl_conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("SELECT COUNT(*) as total FROM newegg_products")
                 total = cur.fetchone()['total']
                 print(f"\n数据库中共有 {total} 条记录")
@@ -676,7 +867,9 @@ class NeweggDataProcessor:
                     print(f"  {c['category']}: {c['count']} 条")
 
         finally:
-            conn.close()
+            pool.putconn(load_conn)
+            pool.putconn(ddl_conn)
+            self.close_pool()
             print("数据库连接已关闭")
 
     def print_summary(self):
@@ -716,6 +909,22 @@ class NeweggDataProcessor:
             print(f"  平均: ${sum(prices)/len(prices):.2f}")
 
 
+# ==================== 多进程清洗 ====================
+# 每个工作进程持有一个处理器实例，避免每个任务都序列化整个对象
+_worker_processor = None
+
+
+def _init_worker():
+    """工作进程初始化：创建本进程的处理器（类别关键词 n-gram 集合和规格解析分发表只构建一次）"""
+    global _worker_processor
+    _worker_processor = NeweggDataProcessor()
+
+
+def _normalize_batch_in_worker(records):
+    """在工作进程中标准化一批记录，返回 [(标题, 标准化结果), ...]"""
+    return [(record.get('title', ''), _worker_processor.normalize_record(record)) for record in records]
+
+
 def main():
     """主函数"""
     db_config = {
@@ -5,11 +5,14 @@ Newegg 商品爬虫脚本
 
 import asyncio
 import json
-import random
 import re
+import urllib.parse
 from datetime import datetime
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser, Locator
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+import httpx
+from playwright.async_api import async_playwright, Page, Route
+from selectolax.lexbor import LexborHTMLParser
 
 
 # ==================== 配置区域 ====================
@@ -36,91 +39,95 @@ MAX_PAGES = 10
 # User-Agent 模拟真实浏览器
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 
-# 随机等待范围（秒）
-MIN_WAIT = 2
-MAX_WAIT = 5
+# 同时抓取的分类数量（页面池大小，所有页面共享同一个 BrowserContext）
+MAX_CONCURRENCY = 4
 
+# 浏览器上下文状态（Cookie、localStorage）持久化文件，下次运行时复用
+STORAGE_STATE_FILE = "newegg_storage_state.json"
 
-# ==================== 数据解析函数 ====================
+# 只读取 DOM，不需要下载的资源类型
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+# 第三方统计/广告请求前缀
+BLOCKED_URL_PREFIXES = (
+    "https://www.google-analytics.com",
+    "https://www.googletagmanager.com",
+    "https://stats.g.doubleclick.net",
+    "https://connect.facebook.net",
+    "https://bat.bing.com",
+)
+
+
+# ==================== 请求拦截 ====================
 
-async def extract_price(price_element: Optional[Locator]) -> str:
+async def block_heavy_resources(route: Route) -> None:
     """
-    提取价格，去除逗号和 $ 符号
-    如果没有价格则返回 "0"
+    拦截图片、字体、样式表、媒体和第三方统计请求，其余请求正常放行
+    图片地址直接从 DOM 属性读取，不需要真正下载图片
     """
-    if not price_element:
-        return "0"
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or request.url.startswith(BLOCKED_URL_PREFIXES):
+        await route.abort()
+    else:
+        await route.continue_()
 
-    try:
-        price_text = await price_element.inner_text()
-        # 移除 $ 符号和逗号
-        price_clean = price_text.replace("$", "").replace(",", "").strip()
-        # 验证是否为有效价格
-        if re.match(r'^\d+\.?\d*$', price_clean):
-            return price_clean
-        return "0"
-    except Exception:
-        return "0"
+
+# ==================== 数据解析函数 ====================
+
+# 对 .item-cell 定位到的所有卡片一次性提取字段，避免每个字段一次 Playwright 往返
+EXTRACT_ITEMS_JS = """
+cells => cells.map(cell => {
+    const title = cell.querySelector('.item-title');
+    const price = cell.querySelector('.price-current strong');
+    const img = cell.querySelector('.item-img img');
+    const features = Array.from(cell.querySelectorAll('ul.item-features li'))
+        .map(li => li.innerText.trim())
+        .filter(Boolean);
+    return {
+        title: title ? title.innerText : '',
+        price: price ? price.innerText : '',
+        img_url: img ? (img.getAttribute('src') || '') : '',
+        item_features: features,
+        href: title ? (title.getAttribute('href') || '') : '',
+    };
+})
+"""
 
 
-async def extract_item_features(item_cell: Locator) -> List[str]:
+_PRICE_STRIP = str.maketrans("", "", "$,")
+_PRICE_OK = re.compile(r'\A\d+\.?\d*\Z').match
+
+
+def extract_price(price_text: str) -> str:
     """
-    提取商品特性列表 (ul.item-features 下的所有 li 文本)
+    提取价格，去除逗号和 $ 符号
+    如果没有价格则返回 "0"
     """
-    features = []
-    try:
-        features_ul = item_cell.locator("ul.item-features")
-        if await features_ul.count() > 0:
-            feature_items = features_ul.locator("li")
-            count = await feature_items.count()
-            for i in range(count):
-                try:
-                    feature_text = await feature_items.nth(i).inner_text()
-                    if feature_text.strip():
-                        features.append(feature_text.strip())
-                except Exception:
-                    continue
-    except Exception:
-        pass
-    return features
+    if not price_text:
+        return "0"
+
+    # 一次 translate 移除 $ 符号和逗号
+    price_clean = price_text.translate(_PRICE_STRIP).strip()
+    # 验证是否为有效价格
+    return price_clean if _PRICE_OK(price_clean) else "0"
 
 
-async def parse_product_item(item_cell: Locator) -> Optional[Dict]:
+def parse_product_item(raw_item: Dict) -> Optional[Dict]:
     """
-    解析单个商品卡片
+    解析单个商品卡片（页面内 evaluate 返回的原始字段）
     返回商品信息字典，解析失败返回 None
     """
     try:
-        # 提取商品标题
-        title_element = item_cell.locator(".item-title").first
-        title = await title_element.inner_text() if await title_element.count() > 0 else ""
-
-        # 提取价格
-        price_element = item_cell.locator(".price-current strong").first
-        price = await extract_price(price_element if await price_element.count() > 0 else None)
-
-        # 提取商品图片
-        img_element = item_cell.locator(".item-img img").first
-        img_url = ""
-        if await img_element.count() > 0:
-            img_url = await img_element.get_attribute("src") or ""
-
-        # 提取商品特性列表
-        item_features = await extract_item_features(item_cell)
-
-        # 提取商品详情链接
-        link_element = item_cell.locator(".item-title").first
-        product_link = ""
-        if await link_element.count() > 0:
-            href = await link_element.get_attribute("href")
-            product_link = href if href and href.startswith("http") else f"https://www.newegg.com{href}" if href else ""
+        # 补全商品详情链接
+        href = raw_item.get("href")
+        product_link = href if href and href.startswith("http") else f"https://www.newegg.com{href}" if href else ""
 
         # 构建商品数据
         product_data = {
-            "title": title.strip(),
-            "price": price,
-            "img_url": img_url,
-            "item_features": item_features,
+            "title": raw_item.get("title", "").strip(),
+            "price": extract_price(raw_item.get("price", "")),
+            "img_url": raw_item.get("img_url", ""),
+            "item_features": raw_item.get("item_features", []),
             "product_link": product_link,
         }
 
@@ -131,6 +138,16 @@ async def parse_product_item(item_cell: Locator) -> Optional[Dict]:
         return None
 
 
+def build_page_url(url: str, page_num: int) -> str:
+    """
+    在分类 URL 上设置/替换 page 查询参数，得到第 page_num 页的地址
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = dict(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    query["page"] = str(page_num)
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
 async def scrape_page(page: Page, url: str, page_num: int) -> List[Dict]:
     """
     抓取单页数据
@@ -146,18 +163,12 @@ async def scrape_page(page: Page, url: str, page_num: int) -> List[Dict]:
         # 等待商品列表加载
         await page.wait_for_selector(".item-cell", timeout=15000)
 
-        # 获取所有商品卡片
-        item_cells = page.locator(".item-cell")
-        count = await item_cells.count()
-        print(f"  📦 找到 {count} 个商品")
+        # evaluate_all 一次往返取回所有商品卡片的字段
+        raw_items = await page.locator(".item-cell").evaluate_all(EXTRACT_ITEMS_JS)
+        print(f"  📦 找到 {len(raw_items)} 个商品")
 
-        # 遍历解析每个商品
-        for i in range(count):
-            item_cell = item_cells.nth(i)
-            product = await parse_product_item(item_cell)
-            if product:
-                products.append(product)
-                print(f"    ✓ [{i+1}/{count}] {product['title'][:50]}...")
+        # 在 Python 端解析每个商品，不再有 Playwright 调用；只在页末汇总打印
+        products = [product for product in map(parse_product_item, raw_items) if product]
 
         print(f"  ✅ 第 {page_num} 页完成，成功解析 {len(products)} 个商品")
 
@@ -167,68 +178,106 @@ async def scrape_page(page: Page, url: str, page_num: int) -> List[Dict]:
     return products
 
 
-async def scrape_category(browser: Browser, url: str) -> List[Dict]:
+async def fetch_page_http(client: httpx.AsyncClient, url: str, page_num: int) -> Tuple[List[Dict], bool]:
+    """
+    用 HTTP 直接抓取单页列表并用 selectolax 解析，不启动浏览器渲染
+    返回 (商品列表, 是否有下一页)；请求失败或未解析到商品时返回空列表
+    """
+    print(f"\n📄 正在抓取第 {page_num} 页 (HTTP): {url}")
+
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"  ⚠️  HTTP 抓取第 {page_num} 页失败: {e}")
+        return [], False
+
+    tree = LexborHTMLParser(response.text)
+
+    products = []
+    for cell in tree.css(".item-cell"):
+        title = cell.css_first(".item-title")
+        price = cell.css_first(".price-current strong")
+        img = cell.css_first(".item-img img")
+        features = [li.text(strip=True) for li in cell.css("ul.item-features li")]
+        raw_item = {
+            "title": title.text() if title else "",
+            "price": price.text() if price else "",
+            "img_url": (img.attributes.get("src") or "") if img else "",
+            "item_features": [feature for feature in features if feature],
+            "href": (title.attributes.get("href") or "") if title else "",
+        }
+        product = parse_product_item(raw_item)
+        if product:
+            products.append(product)
+
+    # 与浏览器路径相同的下一页判断：存在且未禁用的 Next 按钮/链接
+    has_next = False
+    for node in tree.css("button[title='Next'], a[title='Next'], .pagination .next"):
+        classes = (node.attributes.get("class") or "").split()
+        if "disabled" not in node.attributes and "disabled" not in classes:
+            has_next = True
+            break
+
+    if products:
+        print(f"  ✅ 第 {page_num} 页完成 (HTTP)，成功解析 {len(products)} 个商品")
+    return products, has_next
+
+
+async def has_next_page(page: Page) -> bool:
+    """
+    当前页有下一页按钮且未被禁用
+    """
+    next_button = page.locator("button[title='Next']").or_(
+        page.locator(".pagination .next:not(.disabled)")
+    ).or_(
+        page.locator("a[title='Next']")
+    )
+
+    if await next_button.count() == 0:
+        return False
+
+    try:
+        return await next_button.first.is_enabled()
+    except Exception:
+        return False
+
+
+async def scrape_category(client: httpx.AsyncClient, page: Page, url: str) -> List[Dict]:
     """
     抓取整个分类（多页）
+    优先走 HTTP + selectolax，解析不到商品（例如遇到反爬验证页）时回退到页面池借出的浏览器页面
     """
     print(f"\n{'='*60}")
     print(f"🚀 开始抓取分类: {url}")
     print(f"{'='*60}")
 
-    # 创建新页面
-    page = await browser.new_page(user_agent=USER_AGENT)
-
     all_products = []
-    current_url = url
 
     try:
         for page_num in range(1, MAX_PAGES + 1):
-            # 抓取当前页
-            products = await scrape_page(page, current_url, page_num)
-            all_products.extend(products)
+            # 直接按页码拼出列表页 URL，不再点击“下一页”再等待页面重渲染
+            page_url = build_page_url(url, page_num)
 
-            # 检查是否有下一页
-            next_button = page.locator("button[title='Next']").or_(
-                page.locator(".pagination .next:not(.disabled)")
-            ).or_(
-                page.locator("a[title='Next']")
-            )
+            products, has_next = await fetch_page_http(client, page_url, page_num)
+            if not products:
+                print(f"  ↩️  HTTP 未解析到商品，改用浏览器抓取")
+                products = await scrape_page(page, page_url, page_num)
+                has_next = await has_next_page(page)
 
-            has_next = await next_button.count() > 0
-            is_enabled = False
-
-            if has_next:
-                try:
-                    is_enabled = await next_button.first.is_enabled()
-                except Exception:
-                    is_enabled = False
+            all_products.extend(products)
 
-            # 如果没有下一页或已达到最大页数，停止翻页
-            if not has_next or not is_enabled or page_num >= MAX_PAGES:
+            # 如果没有商品、没有下一页或已达到最大页数，停止翻页
+            if not products or not has_next or page_num >= MAX_PAGES:
                 if page_num >= MAX_PAGES:
                     print(f"\n⏹️  已达到最大页数限制 ({MAX_PAGES})")
                 else:
                     print(f"\n✅ 已到达最后一页")
                 break
 
-            # 点击下一页
-            print(f"\n➡️  准备翻到第 {page_num + 1} 页...")
-            await next_button.first.click()
-
-            # 随机等待，防止被反爬
-            wait_time = random.uniform(MIN_WAIT, MAX_WAIT)
-            print(f"⏱️  等待 {wait_time:.1f} 秒...")
-            await asyncio.sleep(wait_time)
-
-            # 获取新的 URL
-            current_url = page.url
-
     except Exception as e:
         print(f"❌ 抓取分类失败: {e}")
 
-    finally:
-        await page.close()
-
     print(f"\n📊 分类抓取完成，共获取 {len(all_products)} 个商品")
     return all_products
 
@@ -246,7 +295,7 @@ async def main():
     print(f"📋 配置:")
     print(f"  - 目标 URL 数量: {len(TARGET_URLS)}")
     print(f"  - 最大页数限制: {MAX_PAGES}")
-    print(f"  - 随机等待: {MIN_WAIT}-{MAX_WAIT} 秒")
+    print(f"  - 并发分类数: {MAX_CONCURRENCY}")
 
     all_data = []
 
@@ -254,17 +303,51 @@ async def main():
         # 启动浏览器（无头模式）
         browser = await p.chromium.launch(headless=True)
 
-        try:
-            # 遍历所有目标 URL
-            for idx, url in enumerate(TARGET_URLS, 1):
+        # 所有分类共享一个上下文；若有上次运行保存的状态则加载，复用 Cookie 等缓存
+        storage_state = STORAGE_STATE_FILE if Path(STORAGE_STATE_FILE).exists() else None
+        context = await browser.new_context(user_agent=USER_AGENT, storage_state=storage_state)
+        # 上下文级拦截，对该上下文中打开的所有页面生效
+        await context.route("**/*", block_heavy_resources)
+
+        # 预先创建页面池，各分类借出/归还页面，池大小即并发上限
+        page_pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(min(MAX_CONCURRENCY, len(TARGET_URLS))):
+            page_pool.put_nowait(await context.new_page())
+
+        async def scrape_category_pooled(idx: int, url: str) -> List[Dict]:
+            page = await page_pool.get()
+            try:
                 print(f"\n\n{'#'*60}")
                 print(f"# 处理第 {idx}/{len(TARGET_URLS)} 个分类")
                 print(f"{'#'*60}")
+                return await scrape_category(client, page, url)
+            finally:
+                page_pool.put_nowait(page)
+
+        # 列表页优先用 HTTP 直接抓取，所有分类共享一个连接池
+        client = httpx.AsyncClient(
+            http2=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=32),
+            timeout=30,
+            follow_redirects=True,
+        )
 
-                products = await scrape_category(browser, url)
+        try:
+            # 并发抓取所有目标 URL，gather 按 TARGET_URLS 顺序返回结果
+            results = await asyncio.gather(*[
+                scrape_category_pooled(idx, url)
+                for idx, url in enumerate(TARGET_URLS, 1)
+            ])
+            for products in results:
                 all_data.extend(products)
 
+            # 保存上下文状态，供下次运行预热
+            await context.storage_state(path=STORAGE_STATE_FILE)
+
         finally:
+            await client.aclose()
+            await context.close()
             await browser.close()
 
     # 保存数据为 JSON
@@ -3,14 +3,214 @@ Sylvane Air Purifiers 数据清洗脚本
 处理 sylvane_raw.json，提取规格参数并导入 PostgreSQL
 """
 
-import re
+import csv
+import functools
+import io
 import json
+import re
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import orjson
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+# 规格提取用到的正则，模块加载时编译一次
+_NUM_COMMA_RE = re.compile(r'[\d,]+')
+_INT_RE = re.compile(r'\d+')
+_NOISE_UNIT_RE = re.compile(r'db|decibels?|dba|decibel\s+level|noise\s+level|maximum|minimum')
+_FLOAT_RE = re.compile(r'\d+\.?\d*')
+_WORD_NUMBERS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+_FAN_SPEEDS_RE = re.compile(r'\b(?:(\d+)|(' + '|'.join(_WORD_NUMBERS) + r'))\b', re.IGNORECASE)
+_MONEY_RE = re.compile(r'[\d,]+\.?\d*')
+_AMAZON_STOP_RE = re.compile(r'\b(?:air purifiers?|hepa|model|series)\b')
+
+# 记录数达到该值才启用多进程清洗，数据量小时单进程更快
+PARALLEL_MIN_RECORDS = 1000
+
+# 清洗进度打印间隔（条）
+PROGRESS_EVERY = 100
+
+
+# ==================== 规格提取函数 ====================
+# 原始数据中大量字段取值重复（例如相同的单位写法），用 lru_cache 缓存解析结果
+
+
+def _cached_text_parser(func):
+    """
+    lru_cache 包装规格解析函数：非字符串取值（列表、字典等不可哈希类型）先转为字符串再查缓存，
+    单条格式异常的记录不会让整个清洗过程因 TypeError 中断
+    """
+    cached = functools.lru_cache(maxsize=4096)(func)
+
+    @functools.wraps(func)
+    def wrapper(value):
+        if value is not None and not isinstance(value, str):
+            value = str(value) if value else ''
+        return cached(value)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@_cached_text_parser
+def extract_coverage_area(value):
+    """从覆盖面积文本中提取数字"""
+    if not value or value == 'N/A':
+        return None
+
+    # 单位和描述文字（"sq. ft."、"Whole House" 等）不含数字，无需先删除，
+    # 直接逐个扫描数字，按合理范围（50-3000 sq. ft.）过滤并保留最大值（通常是总面积）
+    best = 0
+    for match in _NUM_COMMA_RE.finditer(value):
+        try:
+            number = int(match.group().replace(',', ''))
+        except ValueError:
+            continue
+        if 50 <= number <= 3000 and number > best:
+            best = number
+    return best or None
+
+
+@_cached_text_parser
+def _max_int(value):
+    """提取文本中最大的整数（用于烟雾/花粉/灰尘 CADR 值）"""
+    if not value or value == 'N/A':
+        return None
+    numbers = _INT_RE.findall(str(value))
+    return max(map(int, numbers)) if numbers else None
+
+
+@_cached_text_parser
+def extract_noise_level(value):
+    """从噪音文本中提取最低和最高值，返回 (min_noise, max_noise) 元组（缓存结果不可变）"""
+    if not value or value == 'N/A':
+        return None, None
+
+    # 移除 dB、decibel 等单位
+    text = value.lower()
+    text = _NOISE_UNIT_RE.sub('', text)
+    text = text.strip()
+
+    # 提取数字（包括小数）
+    # 匹配整数和小数，例如：53.8, 46, 55.1
+    numbers = _FLOAT_RE.findall(text)
+    # 过滤空字符串并转换为浮点数
+    numbers = [float(n) for n in numbers if n]
+
+    if not numbers:
+        return None, None
+
+    if len(numbers) == 1:
+        # 只有一个数字，min 和 max 相同
+        noise_val = int(numbers[0]) if numbers[0] == int(numbers[0]) else numbers[0]
+        return noise_val, noise_val
+
+    # 取最小和最大
+    min_val = min(numbers)
+    max_val = max(numbers)
+    # 如果是整数则转为 int，否则保留浮点数
+    min_noise = int(min_val) if min_val == int(min_val) else min_val
+    max_noise = int(max_val) if max_val == int(max_val) else max_val
+
+    return min_noise, max_noise
+
+
+@_cached_text_parser
+def extract_fan_speeds(value):
+    """提取风扇档位"""
+    if not value or value == 'N/A':
+        return None
+
+    # 一次扫描同时匹配数字和英文数字（"3"、"Three"、"Two" 等），取最先出现的档位
+    match = _FAN_SPEEDS_RE.search(str(value))
+    if not match:
+        return None
+    if match.group(1):
+        return int(match.group(1))
+    return _WORD_NUMBERS[match.group(2).lower()]
+
+
+@_cached_text_parser
+def extract_price(price_str):
+    """从价格字符串中提取数字"""
+    if not price_str or price_str == '0' or price_str == 'N/A':
+        return None
+
+    # 清理字符串，移除控制字符和换行
+    clean_text = price_str.replace('\n', ' ').replace('\r', ' ')
+    clean_text = clean_text.replace('Sale price', '').replace('Regular price', '')
+    clean_text = clean_text.strip()
+
+    # 逐个扫描数字（包括小数），取第一个有效的价格数字，无需先构建完整列表
+    for match in _MONEY_RE.finditer(clean_text):
+        price = float(match.group().replace(',', ''))
+        if price > 0:
+            return price
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def generate_amazon_link(product_name):
+    """生成 Amazon 搜索链接"""
+    # 简化商品名称，移除通用词
+    title = _AMAZON_STOP_RE.sub('', product_name.lower())
+
+    # 提取关键词（品牌 + 型号前几个词）
+    words = title.split()[:5]
+
+    search_term = " ".join(words)
+    encoded_search = urllib.parse.quote_plus(search_term)
+
+    return f"https://www.amazon.com/s?k={encoded_search}&tag=YOUR_TAG-20"
+
+
+def extract_filter_type(value):
+    """提取滤网类型"""
+    if not value or value == 'N/A':
+        return None
+    return value
+
+
+def _noise_json(noise_level):
+    """噪音范围字典序列化为入库用的 JSON 文本（与原先 json.dumps 的输出一致）"""
+    return json.dumps(noise_level, ensure_ascii=False)
+
+
+def normalize_record(record):
+    """标准化单条记录（不依赖处理器状态，可直接在工作进程中执行）"""
+    product_name = record.get('product_name', '')
+
+    # 提取价格
+    price = extract_price(record.get('price', ''))
+    if not price:
+        return None
+
+    min_noise, max_noise = extract_noise_level(record.get('noise_level'))
+
+    normalized = {
+        'product_name': product_name,
+        'url': record.get('url', ''),
+        'price': price,
+        'image_url': record.get('image_url', ''),
+        'coverage_area': extract_coverage_area(record.get('coverage_area')),
+        'cadr_smoke': _max_int(record.get('cadr_smoke')),
+        'cadr_pollen': _max_int(record.get('cadr_pollen')),
+        'cadr_dust': _max_int(record.get('cadr_dust')),
+        'noise_level': {'min_noise': min_noise, 'max_noise': max_noise},
+        'filter_type': extract_filter_type(record.get('filter_type')),
+        'fan_speeds': extract_fan_speeds(record.get('fan_speeds')),
+        'amazon_link': generate_amazon_link(product_name),
+        'processed_at': datetime.now().isoformat()
+    }
+
+    return normalized
+
 
 class SylvaneDataProcessor:
     """Sylvane 空气净化器数据处理器"""
@@ -40,203 +240,11 @@ class SylvaneDataProcessor:
         if not self.input_file.exists():
             raise FileNotFoundError(f"找不到文件: {self.input_file}")
 
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            self.raw_data = json.load(f)
+        with open(self.input_file, 'rb') as f:
+            self.raw_data = orjson.loads(f.read())
 
         print(f"已加载 {len(self.raw_data)} 条原始数据")
 
-    @staticmethod
-    def extract_coverage_area(value):
-        """从覆盖面积文本中提取数字"""
-        if not value or value == 'N/A':
-            return None
-
-        # 移除 "sq. ft."、"square feet"、"Whole House" 等单位和文本
-        text = value.lower()
-        text = re.sub(r'sq\.?\s*ft\.?|square\s+feet|up\s+to|approximately|covers?\s+up\s+to|whole\s+house|manufacturer-suggested', '', text)
-        text = text.strip()
-
-        # 提取所有数字（限制在合理范围内：10-5000 sq. ft.）
-        numbers = re.findall(r'[\d,]+', text)
-
-        # 取最大的有效数字（通常是总面积）
-        if numbers:
-            cleaned_numbers = [int(n.replace(',', '').strip()) for n in numbers if n.replace(',', '').strip()]
-            # 过滤掉异常值，保留合理的空气净化器覆盖面积
-            valid_numbers = [n for n in cleaned_numbers if 50 <= n <= 3000]
-            if valid_numbers:
-                max_num = max(valid_numbers)
-                return max_num if max_num > 0 else None
-        return None
-
-    @staticmethod
-    def extract_cadr_smoke(value):
-        """从文本中提取烟雾 CADR 值"""
-        if not value or value == 'N/A':
-            return None
-        return self._extract_single_number(value)
-
-    @staticmethod
-    def extract_cadr_pollen(value):
-        """从文本中提取花粉 CADR 值"""
-        if not value or value == 'N/A':
-            return None
-        return self._extract_single_number(value)
-
-    @staticmethod
-    def extract_cadr_dust(value):
-        """从文本中提取灰尘 CADR 值"""
-        if not value or value == 'N/A':
-            return None
-        return self._extract_single_number(value)
-
-    @staticmethod
-    def _extract_single_number(value):
-        """提取单个数值"""
-        if not value:
-            return None
-        # 提取所有数字
-        numbers = re.findall(r'\d+', str(value))
-        if numbers:
-            # 返回最大的数值
-            return max([int(n) for n in numbers])
-        return None
-
-    @staticmethod
-    def extract_noise_level(value):
-        """从噪音文本中提取最低和最高值"""
-        if not value or value == 'N/A':
-            return {'min_noise': None, 'max_noise': None}
-
-        # 移除 dB、decibel 等单位
-        text = value.lower()
-        text = re.sub(r'db|decibels?|dba|decibel\s+level|noise\s+level|maximum|minimum', '', text)
-        text = text.strip()
-
-        # 提取数字（包括小数）
-        # 匹配整数和小数，例如：53.8, 46, 55.1
-        numbers = re.findall(r'\d+\.?\d*', text)
-        # 过滤空字符串并转换为浮点数
-        numbers = [float(n) for n in numbers if n]
-
-        if not numbers:
-            return {'min_noise': None, 'max_noise': None}
-
-        if len(numbers) == 1:
-            # 只有一个数字，min 和 max 相同
-            noise_val = int(numbers[0]) if numbers[0] == int(numbers[0]) else numbers[0]
-            return {'min_noise': noise_val, 'max_noise': noise_val}
-
-        # 取最小和最大
-        min_val = min(numbers)
-        max_val = max(numbers)
-        # 如果是整数则转为 int，否则保留浮点数
-        min_noise = int(min_val) if min_val == int(min_val) else min_val
-        max_noise = int(max_val) if max_val == int(max_val) else max_val
-
-        return {'min_noise': min_noise, 'max_noise': max_noise}
-
-    @staticmethod
-    def extract_filter_type(value):
-        """提取滤网类型"""
-        if not value or value == 'N/A':
-            return None
-        return value
-
-    @staticmethod
-    def extract_fan_speeds(value):
-        """提取风扇档位"""
-        if not value or value == 'N/A':
-            return None
-
-        # 先尝试匹配数字开头的档位描述
-        # 匹配 "3", "Three", "Two" 等
-        text = str(value).lower().strip()
-
-        # 数字模式：直接提取数字
-        number_match = re.search(r'\b(\d+)\b', text)
-        if number_match:
-            return int(number_match.group(1))
-
-        # 文字模式：匹配英文数字
-        word_numbers = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-        }
-        for word, num in word_numbers.items():
-            if word in text:
-                return num
-
-        return None
-
-    @staticmethod
-    def extract_price(price_str):
-        """从价格字符串中提取数字"""
-        if not price_str or price_str == '0' or price_str == 'N/A':
-            return None
-
-        # 清理字符串，移除控制字符和换行
-        clean_text = price_str.replace('\n', ' ').replace('\r', ' ')
-        clean_text = clean_text.replace('Sale price', '').replace('Regular price', '')
-        clean_text = clean_text.strip()
-
-        # 提取所有数字（包括小数）
-        numbers = re.findall(r'[\d,]+\.?\d*', clean_text)
-
-        if numbers:
-            # 取第一个有效的价格数字
-            for num in numbers:
-                price = float(num.replace(',', ''))
-                if price > 0:
-                    return price
-        return None
-
-    @staticmethod
-    def generate_amazon_link(product_name):
-        """生成 Amazon 搜索链接"""
-        # 简化商品名称，移除通用词
-        title = product_name.lower()
-        stop_words = ['air purifier', 'air purifiers', 'hepa', 'model', 'series']
-
-        for word in stop_words:
-            title = title.replace(word, '')
-
-        # 提取关键词（品牌 + 型号前几个词）
-        words = title.split()[:5]
-
-        search_term = " ".join(words)
-        encoded_search = urllib.parse.quote_plus(search_term)
-
-        return f"https://www.amazon.com/s?k={encoded_search}&tag=YOUR_TAG-20"
-
-    def normalize_record(self, record):
-        """标准化单条记录"""
-        product_name = record.get('product_name', '')
-
-        # 提取价格
-        price = self.extract_price(record.get('price', ''))
-        if not price:
-            print(f"  跳过（无价格）: {product_name[:50]}...")
-            return None
-
-        normalized = {
-            'product_name': product_name,
-            'url': record.get('url', ''),
-            'price': price,
-            'image_url': record.get('image_url', ''),
-            'coverage_area': self.extract_coverage_area(record.get('coverage_area')),
-            'cadr_smoke': self.extract_cadr_smoke(record.get('cadr_smoke')),
-            'cadr_pollen': self.extract_cadr_pollen(record.get('cadr_pollen')),
-            'cadr_dust': self.extract_cadr_dust(record.get('cadr_dust')),
-            'noise_level': self.extract_noise_level(record.get('noise_level')),
-            'filter_type': self.extract_filter_type(record.get('filter_type')),
-            'fan_speeds': self.extract_fan_speeds(record.get('fan_speeds')),
-            'amazon_link': self.generate_amazon_link(product_name),
-            'processed_at': datetime.now().isoformat()
-        }
-
-        return normalized
-
     def process_all(self):
         """处理所有数据"""
         print("=" * 60)
@@ -244,16 +252,25 @@ class SylvaneDataProcessor:
         print("=" * 60)
 
         valid_records = []
-
-        for idx, record in enumerate(self.raw_data, 1):
-            normalized = self.normalize_record(record)
-
+        total = len(self.raw_data)
+
+        # 每条记录相互独立：数据量大时分发到多个进程并行清洗（结果保持原始顺序），
+        # 数据量小时进程启动和序列化开销超过收益，直接单进程处理
+        if total < PARALLEL_MIN_RECORDS:
+            results = list(map(normalize_record, self.raw_data))
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(normalize_record, self.raw_data, chunksize=64))
+
+        # 日志统一在主进程按顺序输出：有效记录只按批次打印进度，跳过的记录较少，仍逐条提示
+        for idx, (record, normalized) in enumerate(zip(self.raw_data, results), 1):
             if normalized:
                 valid_records.append(normalized)
-                name = normalized['product_name'][:40]
-                print(f"[{idx}/{len(self.raw_data)}] [OK] {name}")
             else:
-                print(f"[{idx}/{len(self.raw_data)}] [X] 跳过: {record.get('product_name', '')[:50]}...")
+                print(f"[{idx}/{total}] [X] 跳过（无价格）: {record.get('product_name', '')[:50]}...")
+
+            if idx % PROGRESS_EVERY == 0 or idx == total:
+                print(f"[{idx}/{total}] 已处理，有效 {len(valid_records)} 条")
 
         self.processed_data = valid_records
 
@@ -265,8 +282,9 @@ class SylvaneDataProcessor:
         """保存处理后的数据到 JSON"""
         output_path = Path(output_file)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.processed_data, f, ensure_ascii=False, indent=2)
+        # orjson 直接输出 UTF-8 字节，中文不会被转义
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(self.processed_data, option=orjson.OPT_INDENT_2, default=str))
 
         print(f"\n已保存处理后的数据到: {output_path.absolute()}")
 
@@ -352,17 +370,36 @@ class SylvaneDataProcessor:
             conn.rollback()
             raise
 
-    def insert_data(self, conn):
-        """插入数据到数据库"""
-        insert_sql = """
+    def copy_insert(self, conn):
+        """
+        通过 COPY 批量导入数据库
+
+        先用 COPY FROM STDIN 把数据流式写入临时暂存表，
+        再用一条 INSERT ... SELECT ... ON CONFLICT 合并到正式表
+        """
+        # 临时表只在本事务内存在，提交后自动删除
+        create_stage_sql = """
+        CREATE TEMP TABLE sylvane_staging
+            (LIKE sylvane_products INCLUDING DEFAULTS)
+            ON COMMIT DROP;
+        """
+
+        copy_sql = """
+        COPY sylvane_staging (
+            product_name, url, price, image_url, coverage_area,
+            cadr_smoke, cadr_pollen, cadr_dust, noise_level, filter_type, fan_speeds, amazon_link, processed_at
+        ) FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+        """
+
+        merge_sql = """
         INSERT INTO sylvane_products (
             product_name, url, price, image_url, coverage_area,
             cadr_smoke, cadr_pollen, cadr_dust, noise_level, filter_type, fan_speeds, amazon_link, processed_at
-        ) VALUES (
-            %(product_name)s, %(url)s, %(price)s, %(image_url)s, %(coverage_area)s,
-            %(cadr_smoke)s, %(cadr_pollen)s, %(cadr_dust)s, %(noise_level)s,
-            %(filter_type)s, %(fan_speeds)s, %(amazon_link)s, %(processed_at)s
         )
+        SELECT
+            product_name, url, price, image_url, coverage_area,
+            cadr_smoke, cadr_pollen, cadr_dust, noise_level, filter_type, fan_speeds, amazon_link, processed_at
+        FROM sylvane_staging
         ON CONFLICT (product_name) DO UPDATE SET
             price = EXCLUDED.price,
             coverage_area = EXCLUDED.coverage_area,
@@ -374,26 +411,56 @@ class SylvaneDataProcessor:
             fan_speeds = EXCLUDED.fan_speeds,
             amazon_link = EXCLUDED.amazon_link,
             updated_at = CURRENT_TIMESTAMP
+        -- 值没有变化的行不重写，避免无谓的 WAL 和索引维护
+        WHERE (
+            sylvane_products.price, sylvane_products.coverage_area,
+            sylvane_products.cadr_smoke, sylvane_products.cadr_pollen, sylvane_products.cadr_dust,
+            sylvane_products.noise_level, sylvane_products.filter_type,
+            sylvane_products.fan_speeds, sylvane_products.amazon_link
+        ) IS DISTINCT FROM (
+            EXCLUDED.price, EXCLUDED.coverage_area,
+            EXCLUDED.cadr_smoke, EXCLUDED.cadr_pollen, EXCLUDED.cadr_dust,
+            EXCLUDED.noise_level, EXCLUDED.filter_type,
+            EXCLUDED.fan_speeds, EXCLUDED.amazon_link
+        )
         """
 
         try:
             with conn.cursor() as cur:
-                for record in self.processed_data:
-                    clean_record = record.copy()
-
-                    # 2. 遍历所有字段，把 字典(dict) 或 列表(list) 转为 字符串
-                    for key, value in clean_record.items():
-                        if isinstance(value, (dict, list)):
-                            # ensure_ascii=False 保证中文不会变成乱码
-                            clean_record[key] = json.dumps(value, ensure_ascii=False)
-
-                    # 3. 使用处理后的数据执行 SQL
-                    cur.execute(insert_sql, clean_record)
+                cur.execute(create_stage_sql)
+
+                # 同一条 INSERT ... SELECT 内 ON CONFLICT 不能重复更新同一行，按商品名去重（保留最后一条）
+                records = {record['product_name']: record for record in self.processed_data}.values()
+
+                # 构建内存中的 CSV，None 写为 \N，noise_level 字典在这里序列化为 JSON 文本
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                for record in records:
+                    row = [
+                        record['product_name'],
+                        record['url'],
+                        record['price'],
+                        record['image_url'],
+                        record['coverage_area'],
+                        record['cadr_smoke'],
+                        record['cadr_pollen'],
+                        record['cadr_dust'],
+                        _noise_json(record['noise_level']),
+                        record['filter_type'],
+                        record['fan_speeds'],
+                        record['amazon_link'],
+                        record['processed_at'],
+                    ]
+                    writer.writerow(['\\N' if v is None else v for v in row])
+                buf.seek(0)
+
+                cur.copy_expert(copy_sql, buf)
+                cur.execute(merge_sql)
 
                 conn.commit()
-                print(f"成功插入 {len(self.processed_data)} 条记录到数据库")
+                print(f"成功通过 COPY 导入 {len(records)} 条记录到数据库")
         except Exception as e:
-            print(f"插入数据失败: {e}")
+            print(f"COPY 导入数据失败: {e}")
             conn.rollback()
             raise
 
@@ -407,7 +474,7 @@ class SylvaneDataProcessor:
 
         try:
             self.create_table_if_not_exists(conn)
-            self.insert_data(conn)
+            self.copy_insert(conn)
 
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("SELECT COUNT(*) as total FROM sylvane_products")
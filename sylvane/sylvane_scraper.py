@@ -5,13 +5,339 @@ Sylvane Air Purifiers Scraper
 """
 
 import asyncio
-import json
-import random
+import hashlib
+from collections import Counter
 import re
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from urllib.parse import urlsplit
+import orjson
+from aiolimiter import AsyncLimiter
+from playwright.async_api import async_playwright, APIRequestContext, Page, Browser, BrowserContext, Response, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser
+
+
+# 只读取 DOM，不需要下载的资源类型（主图只取 src 属性，HTML 中已有）
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# 第三方统计/广告域名关键字
+BLOCKED_HOST_KEYWORDS = ("google-analytics", "googletagmanager", "doubleclick", "facebook", "hotjar")
+
+
+async def block_heavy_resources(route: Route) -> None:
+    """拦截图片、媒体、字体、样式表和统计请求，其余请求正常放行"""
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(keyword in host for keyword in BLOCKED_HOST_KEYWORDS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 反检测脚本：通过 add_init_script 在每个页面的脚本执行前运行，无需包成函数；
+# 包在块作用域中，const 声明不会成为页面全局变量，避免与页面脚本的同名声明冲突
+STEALTH_SCRIPT = """
+{
+    // 覆盖 navigator.webdriver
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // 覆盖 navigator.plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+
+    // 覆盖 navigator.languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+
+    // 添加 chrome 对象
+    window.chrome = {
+        runtime: {}
+    };
+
+    // 覆盖 permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // 覆盖 playwright 检测
+    Object.defineProperty(navigator, 'automation', {
+        get: () => false
+    });
+}
+"""
+
+# ==================== 选择器配置（模块加载时构建一次） ====================
+
+# 商品标题/价格选择器按优先级排列，页面内依次尝试
+_NAME_SELECTORS = (
+    'h1.product-title',
+    'h1.product__title',
+    'h1[class*="title"]',
+    'h1',
+    '.product-name',
+    '[data-product-title]',
+)
+_PRICE_SELECTORS = (
+    '.product-price',
+    '.price',
+    '[data-product-price]',
+    '.current-price',
+    '.sales-price',
+    'span.money',
+)
+# 只使用第一个主图选择器
+_IMG_SELECTOR = '.product-image img'
+
+# Specifications 标签的各种写法合并为一个选择器列表，一次查询
+_SPEC_TAB_SELECTORS = (
+    'a:has-text("Specifications")',
+    'button:has-text("Specifications")',
+    '[data-tab="Specifications"]',
+    '.tab-specifications',
+    '#specifications-tab',
+)
+_SPEC_TAB_SELECTOR = ', '.join(_SPEC_TAB_SELECTORS)
+
+# 列表页商品链接选择器（找不到时使用后备选择器）
+_PRODUCT_LINK_SELECTOR = 'a[href*="/products/"]'
+_PRODUCT_LINK_FALLBACK_SELECTOR = '.product-item a, .product-card a, .product a'
+# 一次调用取回所有链接的 href
+_HREFS_JS = '(els) => els.map(e => e.getAttribute("href"))'
+
+# 翻页按钮选择器；在页面内一次判断按钮是否存在且可点击
+_NEXT_BUTTON_SELECTOR = 'a[rel="next"], .pagination__next, .next, [aria-label="Next"]'
+_NEXT_ENABLED_JS = """
+(selector) => {
+    const button = document.querySelector(selector);
+    if (!button) return false;
+    const classList = (button.getAttribute('class') || '').toLowerCase();
+    return !button.hasAttribute('disabled') && !classList.includes('disabled');
+}
+"""
+
+# 各项规格及其可能的标签名（按优先级排列）
+_SPECS_TO_EXTRACT = (
+    ('coverage_area', ('Coverage Area', 'Room Size', 'Coverage', 'Area Coverage')),
+    ('cadr_smoke', ('CADR Smoke', 'Smoke CADR', 'CADR - Smoke')),
+    ('cadr_pollen', ('CADR Pollen', 'Pollen CADR', 'CADR - Pollen')),
+    ('cadr_dust', ('CADR Dust', 'Dust CADR', 'CADR - Dust')),
+    ('noise_level', ('Noise Level', 'Sound Level', 'Decibels', 'dB', 'Noise')),
+    ('filter_type', ('Filter Type', 'Filter', 'Filtration', 'Technology')),
+    ('fan_speeds', ('Fan Speeds', 'Speeds', 'Fan Settings', 'Speed Settings')),
+)
+
+
+def _spec_xpaths(spec_name: str) -> Tuple[str, ...]:
+    """某个规格名称对应的多种可能的 XPath 模式（按优先级排列）"""
+    return (
+        # 模式1: 表格形式 (label - value)
+        f'//tr[contains(., "{spec_name}")]//td[last()]',
+        f'//dt[contains(., "{spec_name}")]/following-sibling::dd[1]',
+        # 模式2: 列表形式
+        f'//li[contains(., "{spec_name}")]',
+        # 模式3: div形式
+        f'//div[contains(@class, "spec") and contains(., "{spec_name}")]',
+    )
+
+
+# 标签名 -> XPath 模式
+_SPEC_XPATHS: Dict[str, Tuple[str, ...]] = {
+    label: _spec_xpaths(label)
+    for _, labels in _SPECS_TO_EXTRACT
+    for label in labels
+}
+
+# 传给 EXTRACT_PRODUCT_JS 的完整配置
+_PRODUCT_EXTRACT_CONFIG = {
+    'name_selectors': list(_NAME_SELECTORS),
+    'price_selectors': list(_PRICE_SELECTORS),
+    'image_selector': _IMG_SELECTOR,
+    'specs': [
+        [field_name, [[label, list(_SPEC_XPATHS[label])] for label in labels]]
+        for field_name, labels in _SPECS_TO_EXTRACT
+    ],
+}
+
+# 在详情页内一次性提取标题、价格、主图和所有规格的原始文本
+# 规格部分：每个标签返回 [标签名, 第一个命中模式的元素文本或 null]
+EXTRACT_PRODUCT_JS = """
+(config) => {
+    const firstText = (selectors) => {
+        for (const selector of selectors) {
+            try {
+                const elem = document.querySelector(selector);
+                if (elem) return elem.innerText.trim();
+            } catch (e) {}
+        }
+        return null;
+    };
+    const xpathText = (patterns) => {
+        for (const pattern of patterns) {
+            try {
+                const elem = document.evaluate(
+                    pattern, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+                if (elem) return elem.innerText;
+            } catch (e) {}
+        }
+        return null;
+    };
+    const img = document.querySelector(config.image_selector);
+    const specs = {};
+    for (const [field, labels] of config.specs) {
+        specs[field] = labels.map(([label, patterns]) => [label, xpathText(patterns)]);
+    }
+    return {
+        product_name: firstText(config.name_selectors),
+        price: firstText(config.price_selectors),
+        image_url: img ? (img.getAttribute('src') || '') : '',
+        specs: specs,
+    };
+}
+"""
+
+# 结束时统计抓取成功率的字段
+STAT_FIELDS = ('product_name', 'price', 'coverage_area', 'cadr_smoke', 'filter_type')
+
+# HTTP 快速路径必须拿到的字段，缺失时说明内容依赖 JS 渲染，需回退到浏览器
+_REQUIRED_FIELDS = ('product_name', 'coverage_area')
+
+
+def _node_text(node) -> str:
+    """节点的可见文本（子节点之间用空格分隔），近似 innerText"""
+    return node.text(separator=' ', strip=True)
+
+
+def _first_text(tree: LexborHTMLParser, selectors) -> Optional[str]:
+    """按优先级依次尝试选择器，返回第一个命中元素的文本"""
+    for selector in selectors:
+        try:
+            node = tree.css_first(selector)
+        except Exception:
+            continue
+        if node is not None:
+            return _node_text(node)
+    return None
+
+
+def _following_dd(node):
+    """dt 之后的第一个 dd 兄弟节点"""
+    sibling = node.next
+    while sibling is not None:
+        if sibling.tag == 'dd':
+            return sibling
+        sibling = sibling.next
+    return None
+
+
+def _split_label(text: str) -> Optional[Tuple[str, str]]:
+    """把 "标签: 值" 形式的文本拆成 (标签, 值)"""
+    label, sep, value = text.partition(':')
+    if not sep:
+        return None
+    return label.strip(), value.strip()
+
+
+def _collect_specs(tree: LexborHTMLParser) -> Dict[str, str]:
+    """
+    一次遍历收集页面上所有 标签 -> 值 对（同一标签先出现的优先）
+
+    来源与 _spec_xpaths 的四种模式对应：tr 的首列/末列、dt 与其后的 dd、"标签: 值" 形式的 li、
+    规格行（.spec-row 或 class 含 spec 的 div）
+    """
+    specs: Dict[str, str] = {}
+
+    for row in tree.css('tr'):
+        cells = row.css('th, td')
+        if len(cells) >= 2:
+            specs.setdefault(_node_text(cells[0]).strip(': '), _node_text(cells[-1]))
+
+    for term in tree.css('dt'):
+        dd = _following_dd(term)
+        if dd is not None:
+            specs.setdefault(_node_text(term).strip(': '), _node_text(dd))
+
+    for node in tree.css('li, .spec-row, div[class*="spec"]'):
+        # 包裹整张规格表的容器已由上面的行处理，跳过（lexbor 的 css 结果包含节点自身）
+        if len(node.css('tr, dt, li')) > (node.tag == 'li'):
+            continue
+        label_node = node.css_first('.label')
+        value_node = node.css_first('.value')
+        if label_node is not None and value_node is not None:
+            specs.setdefault(_node_text(label_node).strip(': '), _node_text(value_node))
+            continue
+        pair = _split_label(_node_text(node))
+        if pair:
+            specs.setdefault(*pair)
+
+    return specs
+
+
+def _lookup_spec(specs: Dict[str, str], label: str) -> Optional[str]:
+    """先按标签名精确查找，找不到再匹配包含该标签名的标签（如 "Coverage Area (sq. ft.)"）"""
+    value = specs.get(label)
+    if value is not None:
+        return value
+    return next((text for key, text in specs.items() if label in key), None)
+
+
+def parse_product_html(html: str) -> Dict:
+    """
+    用 selectolax 解析服务端渲染的详情页 HTML，返回与 EXTRACT_PRODUCT_JS 相同结构的结果
+
+    规格表只遍历一次得到 {标签: 值}，各字段的候选标签名在字典中查找
+    """
+    tree = LexborHTMLParser(html)
+    img = tree.css_first(_IMG_SELECTOR)
+    specs = _collect_specs(tree)
+
+    return {
+        'product_name': _first_text(tree, _NAME_SELECTORS),
+        'price': _first_text(tree, _PRICE_SELECTORS),
+        'image_url': (img.attributes.get('src') or '') if img is not None else '',
+        'specs': {
+            field_name: [[label, _lookup_spec(specs, label)] for label in labels]
+            for field_name, labels in _SPECS_TO_EXTRACT
+        },
+    }
+
+
+def resolve_extracted(extracted: Dict) -> Dict:
+    """
+    把提取结果整理为商品字段：依次尝试每个可能的标签名，移除标签名，只保留值
+
+    Args:
+        extracted: EXTRACT_PRODUCT_JS 或 parse_product_html 的返回值
+
+    Returns:
+        商品字段字典，缺失的字段为 "N/A"
+    """
+    fields = {
+        'product_name': extracted['product_name'] or "N/A",
+        'price': extracted['price'] or "N/A",
+        'image_url': extracted['image_url'],
+    }
+    for field_name, candidates in extracted['specs'].items():
+        value = None
+        for label, text in candidates:
+            if text is None:
+                continue
+            text = text.replace(label, '').strip(': \n\t')
+            if text:
+                value = text
+                break
+        fields[field_name] = value or "N/A"
+    return fields
 
 
 class SylvaneScraper:
@@ -21,66 +347,107 @@ class SylvaneScraper:
     START_URL = f"{BASE_URL}/collections/air-purifiers"
     MAX_PAGES = 3  # 测试限制页数
     OUTPUT_FILE = "sylvane_raw.json"
-
-    def __init__(self, headless: bool = True, max_pages: int = MAX_PAGES):
+    JSONL_FILE = "sylvane_raw.jsonl"  # 逐条追加写入的检查点，重新运行时跳过已成功抓取的商品
+    DETAIL_CONCURRENCY = 6  # 同时抓取的详情页数量
+    REQUESTS_PER_MINUTE = 30  # 对站点的导航请求速率上限
+    GOTO_RETRIES = 3  # 超时或 429 时的最大重试次数
+    CACHE_DIR = Path("sylvane_html_cache")  # 详情页 HTML 缓存目录
+    CACHE_TTL = 24 * 3600  # 缓存有效期（秒）
+    USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
+
+    def __init__(self, headless: bool = True, max_pages: int = MAX_PAGES,
+                 use_cache: bool = False, cache_dir: Path = CACHE_DIR):
         """
         初始化爬虫
 
         Args:
             headless: 是否使用无头模式
             max_pages: 最大爬取页数
+            use_cache: 是否缓存详情页 HTML（调试选择器时避免重复请求）
+            cache_dir: HTML 缓存目录
         """
         self.headless = headless
         self.max_pages = max_pages
+        self.use_cache = use_cache
+        self.cache_dir = Path(cache_dir)
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.api: Optional[APIRequestContext] = None
         self.products_data: List[Dict] = []
+        # 各字段成功抓取的数量，每抓完一个商品累加一次
+        self.stats: Counter = Counter()
+        self._out = None
+        # 检查点中已成功抓取的商品 URL
+        self._done_urls = set()
+        # 令牌桶限速：所有页面的导航共享同一个速率上限
+        self.limiter = AsyncLimiter(max_rate=self.REQUESTS_PER_MINUTE, time_period=60)
+
+    def count_stats(self, product_data: Dict):
+        """累加一个商品的各字段成功抓取数量"""
+        for field in STAT_FIELDS:
+            self.stats[field] += product_data.get(field) not in (None, 'N/A', '')
+
+    def load_checkpoint(self):
+        """
+        从 JSONL_FILE 恢复上次运行已成功抓取的商品
 
-    async def apply_stealth(self):
-        """应用反检测脚本"""
-        stealth_script = """
-        () => {
-            // 覆盖 navigator.webdriver
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-
-            // 覆盖 navigator.plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-
-            // 覆盖 navigator.languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-
-            // 添加 chrome 对象
-            window.chrome = {
-                runtime: {}
-            };
-
-            // 覆盖 permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-
-            // 覆盖 playwright 检测
-            Object.defineProperty(navigator, 'automation', {
-                get: () => false
-            });
-        }
+        同一 URL 以最后一行为准；带 error 的记录不算完成，会重新抓取；
+        中断时写了一半的末行直接忽略
         """
-        await self.page.evaluate(stealth_script)
+        path = Path(self.JSONL_FILE)
+        if not path.exists():
+            return
+
+        records: Dict[str, Dict] = {}
+        line = b"\n"
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    product_data = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(product_data, dict) and product_data.get('url'):
+                    records[product_data['url']] = product_data
+        # 末行被截断（没有换行符）时补一个换行，新追加的记录从新行开始
+        if not line.endswith(b"\n"):
+            with open(path, 'ab') as f:
+                f.write(b"\n")
+
+        for url, product_data in records.items():
+            if 'error' in product_data:
+                continue
+            self._done_urls.add(url)
+            self.products_data.append(product_data)
+            self.count_stats(product_data)
+
+        if self._done_urls:
+            print(f"从检查点恢复 {len(self._done_urls)} 个已抓取的商品: {path}")
+
+    async def new_context(self) -> BrowserContext:
+        """创建统一配置的浏览器上下文（视口、UA、语言、资源拦截、反检测脚本）"""
+        context = await self.browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=self.USER_AGENT,
+            locale='en-US',
+        )
+        # 上下文级拦截，对该上下文中打开的所有页面生效
+        await context.route("**/*", block_heavy_resources)
+        # 反检测脚本在创建上下文时安装一次，对其所有页面生效，且先于页面自身脚本执行
+        await context.add_init_script(script=STEALTH_SCRIPT)
+        return context
 
     async def init(self):
         """初始化浏览器"""
         self.playwright = await async_playwright().start()
 
+        # 先读取检查点，再以追加模式打开 JSONL（只打开一次，每个商品一行）
+        self.load_checkpoint()
+        self._out = open(self.JSONL_FILE, 'ab')
+
         # 启动浏览器
         self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
@@ -92,19 +459,17 @@ class SylvaneScraper:
             ]
         )
 
-        # 创建浏览器上下文
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                      '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-            locale='en-US',
-        )
+        # 创建浏览器上下文（列表页使用）
+        self.context = await self.new_context()
 
-        # 创建页面
+        # 创建页面（stealth 脚本已由上下文的 add_init_script 注入）
         self.page = await self.context.new_page()
 
-        # 应用自定义 stealth 脚本
-        await self.apply_stealth()
+        # 详情页优先用 HTTP 直接请求（不打开标签页），与浏览器使用相同的 UA 和语言
+        self.api = await self.playwright.request.new_context(
+            user_agent=self.USER_AGENT,
+            extra_http_headers={'Accept-Language': 'en-US,en;q=0.9'},
+        )
 
         print(f"浏览器初始化完成 (headless={self.headless})")
 
@@ -116,15 +481,43 @@ class SylvaneScraper:
             await self.context.close()
         if self.browser:
             await self.browser.close()
+        if self.api:
+            await self.api.dispose()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+        if self._out:
+            self._out.close()
         print("浏览器已关闭")
 
-    async def random_delay(self, min_sec: float = 2.0, max_sec: float = 5.0):
-        """随机延迟"""
-        delay = random.uniform(min_sec, max_sec)
-        await asyncio.sleep(delay)
-        return delay
+    async def goto(self, page: Page, url: str, **kwargs) -> Optional[Response]:
+        """
+        限速导航：经过令牌桶限速，超时或 HTTP 429 时按指数退避重试
+
+        Args:
+            page: 要导航的页面
+            url: 目标URL
+            **kwargs: 传给 page.goto 的参数
+
+        Returns:
+            page.goto 的响应
+        """
+        for attempt in range(self.GOTO_RETRIES + 1):
+            async with self.limiter:
+                try:
+                    response = await page.goto(url, **kwargs)
+                except PlaywrightTimeoutError:
+                    if attempt == self.GOTO_RETRIES:
+                        raise
+                    delay = 2 ** attempt
+                else:
+                    if response is None or response.status != 429 or attempt == self.GOTO_RETRIES:
+                        return response
+                    # 优先使用服务器给出的 Retry-After（秒）
+                    retry_after = response.headers.get('retry-after', '')
+                    delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+
+            print(f"      请求超时或被限流，{delay} 秒后重试 ({attempt + 1}/{self.GOTO_RETRIES})")
+            await asyncio.sleep(delay)
 
     async def get_product_links_from_page(self) -> List[str]:
         """
@@ -134,28 +527,29 @@ class SylvaneScraper:
             商品详情页URL列表
         """
         product_links = []
+        seen = set()
 
         try:
-            # 等待页面加载后查找商品链接
-            await asyncio.sleep(2)
+            # 等到商品链接出现再查找，不再固定等待
+            try:
+                await self.page.wait_for_selector(_PRODUCT_LINK_SELECTOR, timeout=15000)
+            except PlaywrightTimeoutError:
+                await asyncio.sleep(0.5)
 
-            # 查找所有商品链接 - 使用更多可能的选择器
-            products = await self.page.query_selector_all('a[href*="/products/"]')
+            # 一次调用取回所有商品链接的 href - 使用更多可能的选择器
+            hrefs = await self.page.eval_on_selector_all(_PRODUCT_LINK_SELECTOR, _HREFS_JS)
 
-            if not products:
+            if not hrefs:
                 # 尝试其他选择器
-                products = await self.page.query_selector_all('.product-item a, .product-card a, .product a')
+                hrefs = await self.page.eval_on_selector_all(_PRODUCT_LINK_FALLBACK_SELECTOR, _HREFS_JS)
 
-            for product in products:
-                try:
-                    href = await product.get_attribute('href')
-                    if href and '/products/' in href:
-                        # 构建完整URL
-                        full_url = href if href.startswith('http') else self.BASE_URL + href
-                        if full_url not in product_links:
-                            product_links.append(full_url)
-                except:
-                    continue
+            for href in hrefs:
+                if href and '/products/' in href:
+                    # 构建完整URL
+                    full_url = href if href.startswith('http') else self.BASE_URL + href
+                    if full_url not in seen:
+                        seen.add(full_url)
+                        product_links.append(full_url)
 
             print(f"  从当前页找到 {len(product_links)} 个商品链接")
             return product_links
@@ -167,14 +561,8 @@ class SylvaneScraper:
     async def has_next_page(self) -> bool:
         """检查是否有下一页"""
         try:
-            # 查找 "Next" 按钮或分页链接
-            next_button = await self.page.query_selector('a[rel="next"], .pagination__next, .next, [aria-label="Next"]')
-            if next_button:
-                # 检查按钮是否可点击
-                is_disabled = await next_button.get_attribute('disabled')
-                class_list = await next_button.get_attribute('class') or ''
-                return is_disabled is None and 'disabled' not in class_list.lower()
-            return False
+            # 查找 "Next" 按钮或分页链接，并检查按钮是否可点击
+            return await self.page.evaluate(_NEXT_ENABLED_JS, _NEXT_BUTTON_SELECTOR)
         except:
             return False
 
@@ -182,76 +570,68 @@ class SylvaneScraper:
         """跳转到下一页"""
         try:
             # 查找并点击 "Next" 按钮
-            next_button = await self.page.query_selector('a[rel="next"], .pagination__next, .next, [aria-label="Next"]')
+            next_button = await self.page.query_selector(_NEXT_BUTTON_SELECTOR)
 
             if next_button:
-                await next_button.click()
-                await asyncio.sleep(3)  # 等待页面加载
+                current_url = self.page.url
+                # 点击翻页同样会发起导航，计入限速
+                async with self.limiter:
+                    await next_button.click()
+                # 等待地址切换到下一页（商品链接由 get_product_links_from_page 等待）
+                try:
+                    await self.page.wait_for_url(lambda url: url != current_url, timeout=15000)
+                except PlaywrightTimeoutError:
+                    await asyncio.sleep(0.5)
                 return True
             return False
         except Exception as e:
             print(f"  翻页失败: {e}")
             return False
 
-    async def extract_text_by_label(self, selectors: List[str]) -> Optional[str]:
+    async def fetch_html(self, url: str) -> Optional[str]:
         """
-        根据多个可能的selector选择器提取文本
+        通过 APIRequestContext 直接请求详情页 HTML，经过同一个限速器，HTTP 429 时按指数退避重试
 
         Args:
-            selectors: 选择器列表
+            url: 详情页URL
 
         Returns:
-            提取的文本，失败返回None
+            HTML 文本；请求失败或状态码非 2xx 时返回 None（由调用方回退到浏览器）
         """
-        for selector in selectors:
+        for attempt in range(self.GOTO_RETRIES + 1):
+            async with self.limiter:
+                try:
+                    response = await self.api.get(url, timeout=30000)
+                except Exception as e:
+                    print(f"      HTTP 请求失败: {e}")
+                    return None
             try:
-                elem = await self.page.query_selector(selector)
-                if elem:
-                    text = await elem.inner_text()
-                    return text.strip()
-            except:
-                continue
+                if response.status != 429 or attempt == self.GOTO_RETRIES:
+                    return await response.text() if response.ok else None
+                # 优先使用服务器给出的 Retry-After（秒）
+                retry_after = response.headers.get('retry-after', '')
+                delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+            finally:
+                await response.dispose()
+
+            print(f"      请求被限流，{delay} 秒后重试 ({attempt + 1}/{self.GOTO_RETRIES})")
+            await asyncio.sleep(delay)
         return None
 
-    async def find_spec_value(self, spec_name: str) -> Optional[str]:
-        """
-        在规格区域中查找特定规格的值
-
-        Args:
-            spec_name: 规格名称（如 "Coverage Area", "CADR Smoke"）
-
-        Returns:
-            规格值
-        """
-        # 多种可能的规格选择器模式
-        patterns = [
-            # 模式1: 表格形式 (label - value)
-            f'//tr[contains(., "{spec_name}")]//td[last()]',
-            f'//dt[contains(., "{spec_name}")]/following-sibling::dd[1]',
-            # 模式2: 列表形式
-            f'//li[contains(., "{spec_name}")]',
-            # 模式3: div形式
-            f'//div[contains(@class, "spec") and contains(., "{spec_name}")]',
-        ]
-
-        for pattern in patterns:
-            try:
-                elem = await self.page.query_selector(f'xpath={pattern}')
-                if elem:
-                    text = await elem.inner_text()
-                    # 移除标签名，只保留值
-                    text = text.replace(spec_name, '').strip(': \n\t')
-                    return text if text else None
-            except:
-                continue
+    def cache_path(self, url: str) -> Path:
+        """详情页 URL 对应的缓存文件路径"""
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html"
 
-        return None
+    def is_cache_fresh(self, cache_file: Path) -> bool:
+        """缓存文件存在且未超过有效期"""
+        return cache_file.exists() and time.time() - cache_file.stat().st_mtime < self.CACHE_TTL
 
-    async def scrape_product_detail(self, product_url: str) -> Optional[Dict]:
+    async def scrape_product_detail(self, page: Page, product_url: str) -> Optional[Dict]:
         """
         抓取单个商品的详情页
 
         Args:
+            page: 用于抓取的页面（每个并发任务独占一个）
             product_url: 商品详情页URL
 
         Returns:
@@ -265,98 +645,54 @@ class SylvaneScraper:
         try:
             print(f"    正在抓取: {product_url}")
 
-            # 导航到详情页 - 增加超时时间
-            await self.page.goto(product_url, wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(3)  # 等待动态内容加载
+            cache_file = self.cache_path(product_url) if self.use_cache else None
+            cache_fresh = bool(cache_file) and self.is_cache_fresh(cache_file)
+
+            # 0. 快速路径：服务端渲染的 HTML 直接解析，必填字段齐全则不打开浏览器
+            html = cache_file.read_text(encoding='utf-8') if cache_fresh else await self.fetch_html(product_url)
+            if html:
+                fields = resolve_extracted(parse_product_html(html))
+                if all(fields[field] != "N/A" for field in _REQUIRED_FIELDS):
+                    if cache_file and not cache_fresh:
+                        cache_file.write_text(html, encoding='utf-8')
+                    product_data.update(fields)
+                    print(f"      ✓ 抓取成功 (HTTP): {product_data['product_name'][:50]}...")
+                    return product_data
+                print("      HTML 中缺少必要字段，使用浏览器渲染")
+            else:
+                print("      HTTP 请求未取到 HTML，使用浏览器渲染")
 
-            # 等待主要内容加载
-            try:
-                await self.page.wait_for_selector('body', timeout=5000)
-            except:
-                pass  # 继续尝试
-
-            # 1. 提取商品标题
-            name_selectors = [
-                'h1.product-title',
-                'h1.product__title',
-                'h1[class*="title"]',
-                'h1',
-                '.product-name',
-                '[data-product-title]'
-            ]
-            product_data['product_name'] = await self.extract_text_by_label(name_selectors) or "N/A"
-
-            # 2. 提取价格
-            price_selectors = [
-                '.product-price',
-                '.price',
-                '[data-product-price]',
-                '.current-price',
-                '.sales-price',
-                'span.money'
-            ]
-            price_text = await self.extract_text_by_label(price_selectors)
-            product_data['price'] = price_text or "N/A"
-
-            # 3. 提取主图
-            image_selectors = [
-                '.product-image img',
-                '.product-gallery img',
-                'img[class*="product"]',
-                '.featured-image img',
-                '[data-product-image]'
-            ]
-            img_elem = await self.page.query_selector(image_selectors[0])
-            if img_elem:
-                product_data['image_url'] = await img_elem.get_attribute('src') or ""
+            if cache_fresh:
+                # 命中缓存：直接载入本地 HTML，不访问网站
+                print("      使用缓存的 HTML")
+                await page.set_content(cache_file.read_text(encoding='utf-8'), wait_until='domcontentloaded')
             else:
-                product_data['image_url'] = ""
-
-            # 4. 查找并点击 Specifications 标签/区域
-            spec_tab_selectors = [
-                'a:has-text("Specifications")',
-                'button:has-text("Specifications")',
-                '[data-tab="Specifications"]',
-                '.tab-specifications',
-                '#specifications-tab'
-            ]
+                # 导航到详情页 - 增加超时时间
+                await self.goto(page, product_url, wait_until='domcontentloaded', timeout=60000)
 
-            spec_clicked = False
-            for selector in spec_tab_selectors:
-                try:
-                    tab = await self.page.query_selector(selector)
-                    if tab:
-                        await tab.click()
-                        await asyncio.sleep(1)
-                        spec_clicked = True
-                        print("      已点击 Specifications 标签")
-                        break
-                except:
-                    continue
+            # 等待商品标题出现（与 _NAME_SELECTORS 对应），不再固定等待
+            try:
+                await page.wait_for_selector('h1, .product-title, [data-product-title]', timeout=15000)
+            except PlaywrightTimeoutError:
+                await asyncio.sleep(0.5)  # 继续尝试
 
-            if not spec_clicked:
-                # 可能规格就在页面上，不需要点击
-                print("      未找到规格标签，尝试直接提取")
-
-            # 5. 提取各项规格
-            specs_to_extract = [
-                ('coverage_area', ['Coverage Area', 'Room Size', 'Coverage', 'Area Coverage']),
-                ('cadr_smoke', ['CADR Smoke', 'Smoke CADR', 'CADR - Smoke']),
-                ('cadr_pollen', ['CADR Pollen', 'Pollen CADR', 'CADR - Pollen']),
-                ('cadr_dust', ['CADR Dust', 'Dust CADR', 'CADR - Dust']),
-                ('noise_level', ['Noise Level', 'Sound Level', 'Decibels', 'dB', 'Noise']),
-                ('filter_type', ['Filter Type', 'Filter', 'Filtration', 'Technology']),
-                ('fan_speeds', ['Fan Speeds', 'Speeds', 'Fan Settings', 'Speed Settings']),
-            ]
+            if cache_file and not cache_fresh:
+                cache_file.write_text(await page.content(), encoding='utf-8')
+
+            # 1. 先直接提取：多数主题的规格内容本就在 DOM 中，不需要点击标签
+            fields = resolve_extracted(await page.evaluate(EXTRACT_PRODUCT_JS, _PRODUCT_EXTRACT_CONFIG))
+
+            # 2. 一个规格都没取到时，才点击 Specifications 标签（组合选择器），等规格区域出现后再提取一次
+            if all(fields[field_name] == "N/A" for field_name, _ in _SPECS_TO_EXTRACT):
+                try:
+                    await page.locator(_SPEC_TAB_SELECTOR).first.click(timeout=1000)
+                    print("      已点击 Specifications 标签")
+                    await page.wait_for_selector('table, dl, .spec', state='visible', timeout=2000)
+                    fields = resolve_extracted(await page.evaluate(EXTRACT_PRODUCT_JS, _PRODUCT_EXTRACT_CONFIG))
+                except PlaywrightTimeoutError:
+                    print("      未找到规格标签或规格区域，使用直接提取的结果")
 
-            for field_name, possible_labels in specs_to_extract:
-                value = None
-                for label in possible_labels:
-                    found = await self.find_spec_value(label)
-                    if found:
-                        value = found
-                        break
-                product_data[field_name] = value or "N/A"
+            product_data.update(fields)
 
             print(f"      ✓ 抓取成功: {product_data['product_name'][:50]}...")
             return product_data
@@ -378,8 +714,8 @@ class SylvaneScraper:
         print("=" * 60)
 
         # 访问起始页 - 使用 domcontentloaded 而不是 networkidle
-        await self.page.goto(self.START_URL, wait_until='domcontentloaded', timeout=60000)
-        await asyncio.sleep(5)  # 等待页面完全加载
+        # 商品链接的等待由 get_product_links_from_page 负责
+        await self.goto(self.page, self.START_URL, wait_until='domcontentloaded', timeout=60000)
 
         # 遍历列表页
         while page_num <= self.max_pages:
@@ -394,7 +730,6 @@ class SylvaneScraper:
                 print(f"  准备跳转到第 {page_num + 1} 页...")
                 if await self.go_to_next_page():
                     page_num += 1
-                    await asyncio.sleep(2)
                 else:
                     print("  无法跳转到下一页，结束")
                     break
@@ -409,39 +744,65 @@ class SylvaneScraper:
         unique_links = list(dict.fromkeys(all_links))
         print(f"去重后: {len(unique_links)} 个商品")
 
+        # 跳过检查点中已成功抓取的商品
+        pending_links = [url for url in unique_links if url not in self._done_urls]
+        if len(pending_links) < len(unique_links):
+            print(f"跳过已抓取: {len(unique_links) - len(pending_links)} 个，待抓取: {len(pending_links)} 个")
+
         # 遍历所有商品链接，抓取详情
         print(f"\n开始抓取商品详情...")
         print("=" * 60)
 
-        for idx, product_url in enumerate(unique_links, 1):
-            print(f"\n[{idx}/{len(unique_links)}]")
+        # 共享同一个浏览器，预先创建 DETAIL_CONCURRENCY 个上下文放入队列复用，
+        # 队列大小即同时打开的标签页上限；请求速率由 self.limiter 控制
+        context_pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(min(self.DETAIL_CONCURRENCY, len(pending_links))):
+            context_pool.put_nowait(await self.new_context())
 
-            # 随机延迟
-            await self.random_delay(2, 5)
+        async def worker(idx: int, product_url: str) -> Optional[Dict]:
+            context = await context_pool.get()
+            try:
+                print(f"\n[{idx}/{len(pending_links)}]")
+                page = await context.new_page()
+                try:
+                    product_data = await self.scrape_product_detail(page, product_url)
+                finally:
+                    await page.close()
+                if product_data:
+                    # 每个商品立即追加一行，作为断点检查点
+                    self._out.write(orjson.dumps(product_data) + b"\n")
+                    self._out.flush()
+                    self.count_stats(product_data)
+                return product_data
+            finally:
+                context_pool.put_nowait(context)
 
-            # 抓取商品详情
-            product_data = await self.scrape_product_detail(product_url)
-            if product_data:
-                self.products_data.append(product_data)
+        try:
+            # gather 按 pending_links 顺序返回结果
+            results = await asyncio.gather(*(worker(idx, url) for idx, url in enumerate(pending_links, 1)))
+            self.products_data.extend(product_data for product_data in results if product_data)
+        finally:
+            while not context_pool.empty():
+                await context_pool.get_nowait().close()
 
         print("=" * 60)
         print(f"爬取完成! 共成功抓取 {len(self.products_data)} 个商品")
 
     def save_results(self):
-        """保存结果到JSON文件"""
+        """汇总保存结果到JSON文件（逐条数据已实时写入 JSONL_FILE）"""
         output_path = Path(self.OUTPUT_FILE)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.products_data, f, ensure_ascii=False, indent=2)
+        # orjson 直接输出 UTF-8 字节，中文不会被转义
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(self.products_data, option=orjson.OPT_INDENT_2))
 
         print(f"\n数据已保存到: {output_path.absolute()}")
         print(f"文件大小: {output_path.stat().st_size / 1024:.2f} KB")
 
         # 打印统计信息
         print("\n=== 数据统计 ===")
-        for field in ['product_name', 'price', 'coverage_area', 'cadr_smoke', 'filter_type']:
-            count = sum(1 for p in self.products_data if p.get(field) and p[field] != 'N/A')
-            print(f"  {field}: {count}/{len(self.products_data)}")
+        for field in STAT_FIELDS:
+            print(f"  {field}: {self.stats[field]}/{len(self.products_data)}")
 
 
 async def main():
@@ -4,22 +4,223 @@ AI 调用公共模块
 """
 
 import os
+import re
+import asyncio
+import functools
 import json
-from typing import Optional, List, Dict, Any, Union
+import hashlib
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple, Union, AsyncIterator
 from datetime import datetime
 from pathlib import Path
+from aiolimiter import AsyncLimiter
 from litellm import completion, acompletion
 from litellm.exceptions import APIError, RateLimitError
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+
+# 响应缓存：只缓存低温度（结果基本确定）的请求，先查内存再查磁盘
+CACHE_DIR = Path(os.getenv("AI_CACHE_DIR", Path(tempfile.gettempdir()) / "ai_cache"))
+CACHE_MAX_TEMPERATURE = 0.1
+CACHE_TTL = 7 * 24 * 3600  # 磁盘缓存有效期（秒）
+MEMORY_CACHE_SIZE = 1024  # 内存缓存最多保留的条目数（LRU 淘汰）
+# 内存中保存序列化后的 JSON 文本：每次读取都解析出新对象，调用方修改返回结果不会污染缓存
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# extract_json 使用的正则，模块加载时编译一次
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+
+
+def _json_default(obj):
+    """JSON 序列化兜底：litellm 的 Usage 等对象转为 dict"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    """解析 JSON，优先使用 orjson（解析失败同样抛出 json.JSONDecodeError）"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps_pretty(data: Any) -> bytes:
+    """序列化为带缩进的 UTF-8 JSON 字节，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=_json_default)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=_json_default).encode("utf-8")
+
+
+def _scan_balanced_json(text: str, start: int = 0) -> Optional[Tuple[str, int]]:
+    """
+    从 start 开始线性扫描，找出第一个括号平衡的 {...} 片段（忽略字符串内的括号）
+
+    Returns:
+        (片段, 结束位置)；找不到时返回 None
+    """
+    begin = text.find("{", start)
+    if begin < 0:
+        return None
+
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[begin:i + 1], i + 1
+    return None
+
+
+class _StreamingJsonScanner:
+    """
+    _scan_balanced_json 的增量版本：逐段喂入流式文本，跨片段保留扫描位置和括号深度，
+    每个字符只扫描一次
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []  # 当前未闭合候选片段已收到的内容
+        self._depth = 0
+        self._in_str = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        喂入一段文本
+
+        Returns:
+            本段内闭合的所有括号平衡 {...} 片段（按出现顺序）
+        """
+        completed = []
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self._depth == 0:
+                # 候选片段之外只需找下一个左括号
+                begin = chunk.find("{", i)
+                if begin < 0:
+                    break
+                i = begin
+                segment_start = begin
+            else:
+                segment_start = i
+
+            while i < n:
+                ch = chunk[i]
+                i += 1
+                if self._in_str:
+                    if self._escaped:
+                        self._escaped = False
+                    elif ch == "\\":
+                        self._escaped = True
+                    elif ch == '"':
+                        self._in_str = False
+                elif ch == '"':
+                    self._in_str = True
+                elif ch == "{":
+                    self._depth += 1
+                elif ch == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._parts.append(chunk[segment_start:i])
+                        completed.append("".join(self._parts))
+                        self._parts = []
+                        break
+            else:
+                self._parts.append(chunk[segment_start:])
+        return completed
+
+
+def _cache_key(params: Dict[str, Any]) -> Optional[str]:
+    """
+    根据请求参数计算缓存键（不包含 API 密钥）
+
+    Returns:
+        sha256 十六进制字符串；温度过高或带工具（如联网搜索，结果随时间变化）不缓存时返回 None
+    """
+    if params.get("temperature", 0) >= CACHE_MAX_TEMPERATURE or params.get("tools"):
+        return None
+
+    payload = {k: v for k, v in params.items() if k != "api_key"}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _memory_cache_put(key: str, payload: str):
+    """写入内存缓存（JSON 文本），超过 MEMORY_CACHE_SIZE 时淘汰最久未使用的条目"""
+    _memory_cache[key] = payload
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """读取缓存的响应，未命中或磁盘缓存已过期返回 None"""
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+    else:
+        path = CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime >= CACHE_TTL:
+                return None
+            _memory_cache_put(key, path.read_text(encoding="utf-8"))
+        except OSError:
+            return None
+
+    try:
+        result = json.loads(_memory_cache[key])
+    except json.JSONDecodeError:
+        _memory_cache.pop(key, None)
+        return None
+    return {**result, "cached": True}
+
+
+def _cache_set(key: str, result: Dict[str, Any]):
+    """写入缓存（内存 + 磁盘），磁盘写入失败时忽略"""
+    payload = json.dumps(result, ensure_ascii=False, default=_json_default)
+    _memory_cache_put(key, payload)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"{key}.json").write_text(payload, encoding="utf-8")
+    except OSError:
+        pass
+
 
 class AIClient:
-    """AI 客户端基类"""
+    """
+    AI 客户端基类
+
+    chat 为同步阻塞调用，只在同步代码中使用；在协程（如爬虫的异步抓取流程）中请使用 achat / achat_stream，
+    否则整个事件循环会在等待 LLM 响应期间停住。确实需要在协程中调用同步接口时，
+    用 await asyncio.to_thread(client.chat, messages) 放到线程中执行
+    """
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: str = "zhipu/glm-4-flash",
+        use_cache: bool = True,
         **kwargs
     ):
         """
@@ -29,11 +230,13 @@ class AIClient:
             api_key: API 密钥
             base_url: API 基础 URL
             model: 模型名称
+            use_cache: 是否缓存低温度请求的响应
             **kwargs: 其他参数
         """
         self.api_key = api_key or os.getenv("ZHIPUAI_API_KEY")
         self.base_url = base_url
         self.model = model
+        self.use_cache = use_cache
         self.extra_params = kwargs
 
     def chat(
@@ -45,7 +248,7 @@ class AIClient:
         **kwargs
     ) -> Dict[str, Any]:
         """
-        发送聊天请求
+        发送聊天请求（同步阻塞，协程中请使用 achat）
 
         Args:
             messages: 消息列表，格式: [{"role": "user", "content": "..."}]
@@ -78,8 +281,19 @@ class AIClient:
             if self.base_url:
                 params["api_base"] = self.base_url
 
+            cache_key = _cache_key(params) if self.use_cache else None
+            if cache_key:
+                cached = _cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
             response = completion(**params)
-            return self._parse_response(response)
+            result = self._parse_response(response)
+
+            if cache_key and result.get("success"):
+                _cache_set(cache_key, result)
+
+            return result
 
         except RateLimitError as e:
             return {
@@ -150,6 +364,7 @@ class AIClient:
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict]] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -159,6 +374,7 @@ class AIClient:
             messages: 消息列表
             temperature: 温度参数
             max_tokens: 最大 token 数
+            tools: 工具列表（用于联网等）
             **kwargs: 其他参数
 
         Returns:
@@ -176,15 +392,41 @@ class AIClient:
             if max_tokens:
                 params["max_tokens"] = max_tokens
 
+            if tools:
+                params["tools"] = tools
+
             if self.api_key:
                 params["api_key"] = self.api_key
 
             if self.base_url:
                 params["api_base"] = self.base_url
 
+            cache_key = _cache_key(params) if self.use_cache else None
+            if cache_key:
+                cached = _cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
             response = await acompletion(**params)
-            return self._parse_response(response)
+            result = self._parse_response(response)
+
+            if cache_key and result.get("success"):
+                _cache_set(cache_key, result)
+
+            return result
 
+        except RateLimitError as e:
+            return {
+                "success": False,
+                "error": "rate_limit_exceeded",
+                "message": str(e)
+            }
+        except APIError as e:
+            return {
+                "success": False,
+                "error": "api_error",
+                "message": str(e)
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -192,6 +434,73 @@ class AIClient:
                 "message": str(e)
             }
 
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        异步流式聊天请求，边生成边返回文本片段（不走响应缓存）
+
+        Args:
+            messages: 消息列表
+            temperature: 温度参数
+            max_tokens: 最大 token 数
+            **kwargs: 其他参数
+
+        Yields:
+            增量文本片段；请求失败时直接抛出 litellm 异常
+        """
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            **self.extra_params,
+            **kwargs
+        }
+
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+
+        if self.api_key:
+            params["api_key"] = self.api_key
+
+        if self.base_url:
+            params["api_base"] = self.base_url
+
+        response = await acompletion(**params)
+        try:
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = getattr(chunk.choices[0].delta, "content", None)
+                if content:
+                    yield content
+        finally:
+            # 调用方提前结束迭代时关闭底层连接，停止继续接收 token
+            aclose = getattr(response, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_client(model: str, api_key: Optional[str]) -> AIClient:
+    """按 (模型, API 密钥) 缓存的 AIClient 实例，只在 AIHelper 内部使用，不返回给调用方"""
+    return AIClient(model=model, api_key=api_key)
+
+
+def _get_client(model: str, api_key: Optional[str]) -> AIClient:
+    """
+    AIHelper 各方法内部复用的 AIClient
+
+    先解析环境变量中的 API 密钥再查缓存，运行中修改 ZHIPUAI_API_KEY 后会使用新密钥；
+    实例不对外暴露，其可变属性（model、extra_params 等）不会被调用方修改
+    """
+    return _cached_client(model, api_key or os.getenv("ZHIPUAI_API_KEY"))
+
 
 class AIHelper:
     """
@@ -241,7 +550,7 @@ class AIHelper:
             api_key: API 密钥（可选，默认从环境变量读取）
 
         Returns:
-            AIClient 实例
+            新的 AIClient 实例（调用方可自由修改其属性，不影响 AIHelper 的其他方法）
         """
         return AIClient(model=model, api_key=api_key)
 
@@ -256,7 +565,7 @@ class AIHelper:
         **kwargs
     ) -> Dict[str, Any]:
         """
-        简单的文本对话
+        简单的文本对话（同步阻塞，协程中请使用 AIHelper.achat）
 
         Args:
             prompt: 用户输入
@@ -277,7 +586,7 @@ class AIHelper:
 
         messages.append({"role": "user", "content": prompt})
 
-        client = AIClient(model=model, api_key=api_key)
+        client = _get_client(model, api_key)
 
         # 如果启用联网搜索
         tools = [AIHelper.WEB_SEARCH_TOOL] if enable_web_search else None
@@ -343,9 +652,253 @@ class AIHelper:
         Returns:
             响应结果字典
         """
-        client = AIClient(model=model, api_key=api_key)
+        client = _get_client(model, api_key)
         return client.chat(messages=messages, temperature=temperature, **kwargs)
 
+    @staticmethod
+    async def achat(
+        prompt: str,
+        model: str = "zhipu/glm-4-flash",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        enable_web_search: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        异步文本对话（多个独立请求可用 asyncio.gather 并发）
+
+        Args:
+            prompt: 用户输入
+            model: 模型名称
+            system_prompt: 系统提示词
+            temperature: 温度参数
+            api_key: API 密钥
+            enable_web_search: 是否启用联网搜索
+            **kwargs: 其他参数
+
+        Returns:
+            响应结果字典
+        """
+        messages = []
+
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        messages.append({"role": "user", "content": prompt})
+
+        client = _get_client(model, api_key)
+
+        # 如果启用联网搜索
+        tools = [AIHelper.WEB_SEARCH_TOOL] if enable_web_search else None
+
+        return await client.achat(
+            messages=messages,
+            temperature=temperature,
+            tools=tools,
+            **kwargs
+        )
+
+    @staticmethod
+    async def achat_with_web_search(
+        prompt: str,
+        model: str = "zhipu/glm-4-flash",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        异步带联网搜索的对话
+
+        Args:
+            prompt: 用户输入
+            model: 模型名称
+            system_prompt: 系统提示词
+            temperature: 温度参数
+            api_key: API 密钥
+            **kwargs: 其他参数
+
+        Returns:
+            响应结果字典
+        """
+        return await AIHelper.achat(
+            prompt=prompt,
+            model=model,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            api_key=api_key,
+            enable_web_search=True,
+            **kwargs
+        )
+
+    @staticmethod
+    async def achat_conversation(
+        messages: List[Dict[str, str]],
+        model: str = "zhipu/glm-4-flash",
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        异步多轮对话
+
+        Args:
+            messages: 消息历史
+            model: 模型名称
+            temperature: 温度参数
+            api_key: API 密钥
+            **kwargs: 其他参数
+
+        Returns:
+            响应结果字典
+        """
+        client = _get_client(model, api_key)
+        return await client.achat(messages=messages, temperature=temperature, **kwargs)
+
+    @staticmethod
+    async def achat_stream(
+        prompt: str,
+        model: str = "zhipu/glm-4-flash",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        异步流式文本对话，逐段返回生成的文本
+
+        Args:
+            prompt: 用户输入
+            model: 模型名称
+            system_prompt: 系统提示词
+            temperature: 温度参数
+            api_key: API 密钥
+            **kwargs: 其他参数
+
+        Yields:
+            增量文本片段
+        """
+        messages = []
+
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        messages.append({"role": "user", "content": prompt})
+
+        client = _get_client(model, api_key)
+        stream = client.achat_stream(messages=messages, temperature=temperature, **kwargs)
+        try:
+            async for content in stream:
+                yield content
+        finally:
+            # 外层被提前关闭时显式关闭内层生成器，立即释放 litellm 的流式连接，而不是等待垃圾回收
+            await stream.aclose()
+
+    @staticmethod
+    async def achat_json_stream(
+        prompt: str,
+        model: str = "zhipu/glm-4-flash",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Optional[Dict]:
+        """
+        流式请求 JSON 结果：收到第一个完整的 {...} 后立即解析并停止接收剩余内容
+
+        Args:
+            prompt: 用户输入
+            model: 模型名称
+            system_prompt: 系统提示词
+            temperature: 温度参数
+            api_key: API 密钥
+            **kwargs: 其他参数
+
+        Returns:
+            解析后的 JSON 字典；流结束仍未得到完整对象时按 extract_json 兜底，失败返回 None
+        """
+        parts: List[str] = []
+        scanner = _StreamingJsonScanner()
+        stream = AIHelper.achat_stream(
+            prompt,
+            model=model,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            api_key=api_key,
+            **kwargs
+        )
+        try:
+            async for content in stream:
+                parts.append(content)
+                # 扫描器跨片段保留状态，只扫描新到的文本；解析失败的候选（如正文中的 {...}）直接跳过
+                for candidate in scanner.feed(content):
+                    try:
+                        return _json_loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+        finally:
+            await stream.aclose()
+
+        return AIHelper.extract_json("".join(parts))
+
+    @staticmethod
+    async def achat_batch(
+        prompts: List[str],
+        model: str = "zhipu/glm-4-flash",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        concurrency: int = 8,
+        rpm: int = 60,
+        max_retries: int = 3,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        批量异步对话：并发发送多个独立请求，限制并发数和每分钟请求数
+
+        Args:
+            prompts: 用户输入列表
+            model: 模型名称
+            system_prompt: 系统提示词（所有请求共用）
+            temperature: 温度参数
+            api_key: API 密钥
+            concurrency: 最大并发请求数
+            rpm: 每分钟最大请求数
+            max_retries: 触发限流时的最大重试次数（指数退避）
+            **kwargs: 其他参数
+
+        Returns:
+            响应结果字典列表，顺序与 prompts 一致
+        """
+        client = _get_client(model, api_key)
+        limiter = AsyncLimiter(max_rate=rpm, time_period=60)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        messages_prefix = [{"role": "system", "content": system_prompt}] if system_prompt else []
+
+        async def worker(prompt: str) -> Dict[str, Any]:
+            messages = messages_prefix + [{"role": "user", "content": prompt}]
+            for attempt in range(max_retries + 1):
+                async with semaphore, limiter:
+                    result = await client.achat(messages=messages, temperature=temperature, **kwargs)
+                if result.get("error") != "rate_limit_exceeded" or attempt == max_retries:
+                    return result
+                await asyncio.sleep(2 ** attempt)
+            return result
+
+        results = await asyncio.gather(*(worker(prompt) for prompt in prompts), return_exceptions=True)
+
+        # 异常统一转为与其他接口一致的失败结果
+        return [
+            result if not isinstance(result, BaseException) else {
+                "success": False,
+                "error": "async_error",
+                "message": str(result)
+            }
+            for result in results
+        ]
+
     @staticmethod
     def extract_json(response: str) -> Optional[Dict]:
         """
@@ -359,24 +912,27 @@ class AIHelper:
         """
         try:
             # 尝试直接解析
-            return json.loads(response)
+            return _json_loads(response)
         except json.JSONDecodeError:
             # 尝试提取 JSON 代码块
-            import re
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
+            json_match = _JSON_BLOCK_RE.search(response)
             if json_match:
                 try:
-                    return json.loads(json_match.group(1))
+                    return _json_loads(json_match.group(1))
                 except json.JSONDecodeError:
                     pass
 
-            # 尝试提取大括号内容
-            brace_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if brace_match:
+            # 尝试提取括号平衡的大括号内容，解析失败则继续找下一个
+            position = 0
+            while True:
+                found = _scan_balanced_json(response, position)
+                if not found:
+                    break
+                candidate, position = found
                 try:
-                    return json.loads(brace_match.group(0))
+                    return _json_loads(candidate)
                 except json.JSONDecodeError:
-                    pass
+                    continue
 
             return None
 
@@ -404,8 +960,8 @@ class AIHelper:
             "response": response
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps_pretty(data))
 
         print(f"对话记录已保存到: {filepath}")
 